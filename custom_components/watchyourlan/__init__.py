@@ -1,125 +1,171 @@
 """Initialize the WatchYourLAN integration."""
-import asyncio
 import logging
-from datetime import timedelta
 
-import aiohttp
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.update_coordinator import (
-    DataUpdateCoordinator,
-    UpdateFailed,
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback
+from homeassistant.exceptions import ConfigEntryNotReady, Unauthorized, UnknownUser
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .api import async_get_session, async_release_session
+from .const import (
+    CONF_PUSH_UPDATES,
+    CONF_WEBHOOK_ID,
+    DEVICE_PRUNE_INTERVAL,
+    DOMAIN,
+    EXPORT_FORMATS,
+    SERVICE_EXPORT_INVENTORY,
+    SERVICE_PRUNE_DEVICES,
 )
-
-from .const import DOMAIN
+from .coordinator import WatchYourLANCoordinator
+from .export import iter_inventory, write_inventory
+from .maintenance import async_prune_devices
+from .push import async_register_webhook
+from .snapshot import HostSnapshotStore
 
 _LOGGER = logging.getLogger(__name__)
 
+EXPORT_INVENTORY_SCHEMA = vol.Schema({
+    vol.Optional("format", default="csv"): vol.In(EXPORT_FORMATS),
+    vol.Optional("gzip", default=False): cv.boolean,
+    vol.Optional("include_history", default=True): cv.boolean,
+})
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up WatchYourLAN from a config entry."""
-    host = entry.data["host"]
-    port = entry.data["port"]
-    scan_interval = entry.data["scan_interval"]
-
-    session = aiohttp.ClientSession()
-
-    coordinator = WatchYourLANCoordinator(
-        hass,
-        session,
-        host,
-        port,
-        scan_interval,
-    )
+    session = async_get_session(hass)
+    coordinator = WatchYourLANCoordinator(hass, session, entry)
 
-    try:
-        await coordinator.async_config_entry_first_refresh()
+    # With a cached snapshot, entities come up immediately and the first
+    # poll runs in the background; otherwise the server must answer first.
+    restored = await coordinator.async_restore_snapshot()
+    if not restored:
+        try:
+            await coordinator.async_config_entry_first_refresh()
 
-    except (ConfigEntryNotReady, UpdateFailed) as err:
-        _LOGGER.warning("Failed initial WatchYourLAN update: %s", err)
-        await session.close()
-        raise ConfigEntryNotReady from err
-    except Exception as exc:
-        _LOGGER.error("Unexpected error setting up WatchYourLAN: %s", exc)
-        await session.close()
-        raise
+        except (ConfigEntryNotReady, UpdateFailed) as err:
+            _LOGGER.warning("Failed initial WatchYourLAN update: %s", err)
+            await async_release_session(hass)
+            raise ConfigEntryNotReady from err
+        except Exception as exc:
+            _LOGGER.error("Unexpected error setting up WatchYourLAN: %s", exc)
+            await async_release_session(hass)
+            raise
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "coordinator": coordinator,
-        "session": session,
     }
 
     await hass.config_entries.async_forward_entry_setups(
         entry, ["sensor", "binary_sensor", "device_tracker"]
     )
 
+    if entry.options.get(CONF_PUSH_UPDATES) and entry.options.get(CONF_WEBHOOK_ID):
+        entry.async_on_unload(async_register_webhook(hass, entry, coordinator))
+
+    entry.async_on_unload(coordinator.async_stop_presence_timer)
+
+    @callback
+    def _async_scheduled_prune(_now):
+        async_prune_devices(hass, entry, coordinator)
+
+    entry.async_on_unload(
+        async_track_time_interval(hass, _async_scheduled_prune, DEVICE_PRUNE_INTERVAL)
+    )
+    _async_register_services(hass)
+    entry.async_on_unload(entry.add_update_listener(async_options_updated))
+
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), "watchyourlan_initial_refresh"
+        )
+
     return True
 
+@callback
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register the integration's services once, for all entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_PRUNE_DEVICES):
+        return
+
+    async def _async_handle_prune(call: ServiceCall) -> None:
+        for entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if entry is not None:
+                async_prune_devices(hass, entry, entry_data["coordinator"])
+
+    # Both services are admin-only: one deletes devices, the other writes
+    # files of any size into the configuration directory
+    async_register_admin_service(hass, DOMAIN, SERVICE_PRUNE_DEVICES, _async_handle_prune)
+
+    async def _async_handle_export(call: ServiceCall) -> dict:
+        await _async_check_admin(hass, call)
+        fmt = call.data["format"]
+        suffix = f".{fmt}.gz" if call.data["gzip"] else f".{fmt}"
+        files = []
+        for entry_id, entry_data in list(hass.data.get(DOMAIN, {}).items()):
+            coordinator = entry_data["coordinator"]
+            hosts = (coordinator.data or {}).get("hosts", [])
+            history = coordinator.history if call.data["include_history"] else None
+            path = hass.config.path(f"watchyourlan_inventory_{entry_id}{suffix}")
+            # The host list is replaced, never mutated, by later polls
+            count = await hass.async_add_executor_job(
+                write_inventory, path, iter_inventory(hosts, history), fmt, call.data["gzip"]
+            )
+            _LOGGER.info("Exported %s WatchYourLAN hosts to %s", count, path)
+            files.append({"entry_id": entry_id, "path": path, "hosts": count})
+        return {"files": files}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_INVENTORY,
+        _async_handle_export,
+        schema=EXPORT_INVENTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+async def _async_check_admin(hass: HomeAssistant, call: ServiceCall) -> None:
+    """
+    Refuse calls from users that are not admins, like
+    async_register_admin_service does. That helper cannot return a service
+    response, so export_inventory checks for itself.
+    """
+    if not call.context.user_id:
+        return
+    user = await hass.auth.async_get_user(call.context.user_id)
+    if user is None:
+        raise UnknownUser(context=call.context)
+    if not user.is_admin:
+        raise Unauthorized(context=call.context)
+
+async def async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """
+    Apply saved options. Changes to the tracked devices are applied live;
+    anything else (connection, polling, presence) reloads the entry.
+    """
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    if coordinator.async_apply_options(entry.options):
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the persisted host snapshot when the entry is removed."""
+    await HostSnapshotStore(hass, entry.entry_id).async_remove()
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a WatchYourLAN config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(
         entry, ["sensor", "binary_sensor", "device_tracker"]
     )
     if unload_ok:
-        session = hass.data[DOMAIN][entry.entry_id]["session"]
-        await session.close()
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)["coordinator"]
+        await coordinator.snapshot.async_flush()
+        await async_release_session(hass)
+        if not hass.data[DOMAIN]:
+            hass.services.async_remove(DOMAIN, SERVICE_PRUNE_DEVICES)
+            hass.services.async_remove(DOMAIN, SERVICE_EXPORT_INVENTORY)
     return unload_ok
-
-class WatchYourLANCoordinator(DataUpdateCoordinator):
-    """DataUpdateCoordinator to fetch data from WatchYourLAN's API."""
-
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        session: aiohttp.ClientSession,
-        host: str,
-        port: int,
-        interval: int,
-    ):
-        """Initialize the coordinator."""
-        super().__init__(
-            hass,
-            _LOGGER,
-            name="WatchYourLAN",
-            update_interval=timedelta(seconds=interval),
-        )
-        self._session = session
-        self._api_url = f"http://{host}:{port}/api/all"
-
-    async def _async_update_data(self) -> dict:
-        """Fetch the latest data from the WatchYourLAN API."""
-        try:
-            async with self._session.get(self._api_url) as resp:
-                if resp.status != 200:
-                    raise UpdateFailed(
-                        f"Unexpected status from WatchYourLAN API: {resp.status}"
-                    )
-                data = await resp.json()
-
-                if isinstance(data, list):
-                    # Wrap the list in {"hosts": []} 
-                    wrapped_hosts = []
-                    for item in data:
-                        wrapped_hosts.append(
-                            {
-                                "id": item.get("ID"),
-                                "mac": item.get("Mac"),
-                                "name": item.get("Name") or "",
-                                "online": bool(item.get("Now")),
-                                "known": bool(item.get("Known")),
-                                "ip": item.get("IP"),
-                                "vendor": item.get("Hw"),
-                                "iface": item.get("Iface"),
-                                "dns": item.get("DNS"),
-                                "date": item.get("Date"),
-                            }
-                        )
-                    return {"hosts": wrapped_hosts}
-                elif isinstance(data, dict):
-                    return data
-                else:
-                    raise UpdateFailed(f"Invalid JSON structure: {data}")
-
-        except Exception as err:
-            raise UpdateFailed(f"Error communicating with WatchYourLAN: {err}") from err
@@ -0,0 +1,153 @@
+"""HTTP client and plumbing shared by all WatchYourLAN config entries."""
+import hashlib
+import json
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant, callback
+
+from .const import CONNECTION_LIMIT_PER_HOST, DOMAIN, KEEPALIVE_TIMEOUT
+
+try:
+    import orjson
+except ImportError:  # orjson ships with Home Assistant, but stay optional
+    orjson = None
+
+DATA_SESSION = f"{DOMAIN}_session"
+
+# Returned instead of a payload when /api/all has not changed since last time
+NOT_MODIFIED = object()
+
+
+class WatchYourLANApiError(Exception):
+    """Raised when the WatchYourLAN API returns an unusable response."""
+
+
+def json_loads(body: bytes):
+    """Decode a JSON body, using orjson when it is available."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+@callback
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """
+    Return the integration-wide aiohttp session, creating it on first use.
+
+    All config entries share one keep-alive connection pool, so polls
+    reuse TCP connections instead of reconnecting every interval.
+    """
+    session = hass.data.get(DATA_SESSION)
+    if session is not None and not session.closed:
+        return session
+
+    connector = aiohttp.TCPConnector(
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    session = aiohttp.ClientSession(connector=connector)
+    hass.data[DATA_SESSION] = session
+
+    async def _async_close_session(event):
+        await session.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+    return session
+
+
+async def async_release_session(hass: HomeAssistant):
+    """Close the shared session once no config entry is using it anymore."""
+    if hass.data.get(DOMAIN):
+        return
+    session = hass.data.pop(DATA_SESSION, None)
+    if session is not None:
+        await session.close()
+
+
+def build_timeout(connect_timeout, read_timeout) -> aiohttp.ClientTimeout:
+    """Return per-request timeouts for the WatchYourLAN API."""
+    return aiohttp.ClientTimeout(
+        total=None,
+        sock_connect=connect_timeout,
+        sock_read=read_timeout,
+    )
+
+
+class WatchYourLANClient:
+    """
+    Fetches host data from one WatchYourLAN server.
+
+    Sends ETag / Last-Modified validators when the server provides them and
+    otherwise compares a digest of the raw body, so an unchanged LAN is
+    detected without parsing the JSON at all.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, host, port, timeout):
+        self._session = session
+        self._timeout = timeout
+        self.base_url = f"http://{host}:{port}"
+        self._etag = None
+        self._last_modified = None
+        self._body_digest = None
+        # Validators of the last body returned, until commit_validators()
+        self._pending_validators = None
+
+    async def async_get_all(self, conditional=True):
+        """
+        Return the raw /api/all body, or NOT_MODIFIED if it is the same as
+        on the previous call. Pass conditional=False to force a full
+        download, e.g. when the caller has no previous data.
+
+        Decoding is left to the caller so large bodies can be parsed off
+        the event loop; call commit_validators() once it succeeded.
+        """
+        headers = {}
+        if conditional:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+
+        async with self._session.get(
+            f"{self.base_url}/api/all", headers=headers, timeout=self._timeout
+        ) as resp:
+            if resp.status == 304 and conditional:
+                return NOT_MODIFIED
+            if resp.status != 200:
+                raise WatchYourLANApiError(
+                    f"Unexpected status from WatchYourLAN API: {resp.status}"
+                )
+            body = await resp.read()
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if conditional and digest == self._body_digest:
+            return NOT_MODIFIED
+
+        # Only remembered once the caller has decoded the body, so a body
+        # that turns out to be invalid is downloaded again next time
+        self._pending_validators = (etag, last_modified, digest)
+        return body
+
+    def commit_validators(self):
+        """Remember the validators of the last body once it was decoded successfully."""
+        if self._pending_validators is not None:
+            self._etag, self._last_modified, self._body_digest = self._pending_validators
+            self._pending_validators = None
+
+    async def async_get_host(self, host_id):
+        """Return the decoded /api/host/<id> record for a single host."""
+        async with self._session.get(
+            f"{self.base_url}/api/host/{host_id}", timeout=self._timeout
+        ) as resp:
+            if resp.status != 200:
+                raise WatchYourLANApiError(
+                    f"Unexpected status from WatchYourLAN API: {resp.status}"
+                )
+            data = json_loads(await resp.read())
+
+        if not isinstance(data, dict):
+            raise WatchYourLANApiError(f"Invalid host record: {data}")
+        return data
@@ -1,12 +1,14 @@
 """Binary sensors for WatchYourLAN, creating separate child devices for each tracked host."""
 import logging
+import time
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
+from .entity import WatchYourLANHostEntity, async_setup_host_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,48 +18,33 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     entry_id = entry.entry_id
 
-    # The user-chosen MACs from your Options Flow
-    chosen_macs = entry.options.get("devices_to_track", [])
+    # One child device per tracked host; entities follow the tracked set
+    # (options and auto-tracking) without reloading the entry.
+    async_setup_host_entities(
+        hass,
+        entry,
+        coordinator,
+        async_add_entities,
+        lambda host: WatchYourLANHostPresenceSensor(coordinator, entry_id, host),
+    )
 
-    entities = []
-    data = coordinator.data
-    if data and "hosts" in data:
-        hosts = data["hosts"]
-        if isinstance(hosts, list) and hosts:
-            for host in hosts:
-                mac = host.get("mac")
-                if mac and mac in chosen_macs:
-                    # Create a separate child device for this host
-                    entities.append(WatchYourLANHostPresenceSensor(coordinator, entry_id, host))
-        else:
-            _LOGGER.warning("No hosts found in WatchYourLAN data or data is not a list")
-    else:
-        _LOGGER.warning("No hosts data in WatchYourLAN coordinator")
 
-    async_add_entities(entities, True)
-
-
-class WatchYourLANHostPresenceSensor(CoordinatorEntity, BinarySensorEntity):
+class WatchYourLANHostPresenceSensor(WatchYourLANHostEntity, BinarySensorEntity):
     """
     A binary sensor for each tracked host, represented as a separate device in HA.
     """
 
     def __init__(self, coordinator, entry_id, host_data):
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, host_data)
         self._entry_id = entry_id
-        self._host_id = host_data.get("id", "unknown")
-        self._mac = host_data.get("mac", "unknown")
-        self._ip = host_data.get("ip", "")
-        self._known = host_data.get("known", False)
-        self._vendor = host_data.get("vendor", "")
-        self._name = host_data.get("name") or self._mac or "Unknown Device"
-        self._is_on = host_data.get("online", False)
+        self._mac = host_data.mac or "unknown"
+        self._is_on = coordinator.is_present(self._mac)
 
     @property
     def name(self):
         """Return the entity's name."""
-        return f"{self._name} Presence"
+        return f"{self._descriptor.name} Presence"
 
     @property
     def is_on(self):
@@ -69,52 +56,31 @@ class WatchYourLANHostPresenceSensor(CoordinatorEntity, BinarySensorEntity):
         """Return a unique ID for this sensor."""
         return f"watchyourlan_binary_sensor_{self._mac}"
 
-    @property
-    def device_info(self):
-        """
-        Make this sensor appear as a *separate device* (the tracked host),
-        with 'via_device' pointing to our 'hub' device (the server).
-        """
-        return {
-            # Unique identifier for this device, based on MAC
-            "identifiers": {(DOMAIN, self._mac)},
-            "name": self._name,
-            "manufacturer": self._vendor or "WatchYourLAN",
-            "model": "Tracked Host",
-            # 'via_device': tie this child device to the main hub device
-            "via_device": (DOMAIN, self._entry_id),
-        }
-
     @property
     def extra_state_attributes(self):
-        """Return extra attributes about the host."""
+        """Return extra attributes about the host, including its recent history."""
+        now = time.time()
+        history = self.coordinator.history
+        last_seen = history.last_seen(self._mac_key, now)
+        presence = history.host_stats(self._mac_key, now)
         return {
-            "mac": self._mac,
-            "ip": self._ip,
-            "known": self._known,
-            "vendor": self._vendor,
-            "host_id": self._host_id,
+            **self._descriptor.attributes,
+            "last_seen": dt_util.utc_from_timestamp(last_seen).isoformat()
+            if last_seen is not None else None,
+            "online_seconds_24h": presence["online_seconds"],
+            "flaps_24h": presence["flaps"],
         }
 
     @callback
     def _handle_coordinator_update(self):
         """Handle updated data from the coordinator."""
-        found = False
-        data = self.coordinator.data
-        if data and "hosts" in data and isinstance(data["hosts"], list):
-            for host in data["hosts"]:
-                if host.get("mac") == self._mac:
-                    self._is_on = host.get("online", False)
-                    self._ip = host.get("ip", self._ip)
-                    self._known = host.get("known", self._known)
-                    new_name = host.get("name")
-                    if new_name and new_name not in ("null", self._name, self._mac):
-                        self._name = new_name
-                    found = True
-                    break
-
-            if not found and self._mac != "none":
-                # If the host is missing from updated data, mark offline
-                self._is_on = False
+        if not self._host_update_pending():
+            return
+
+        if self.coordinator.data:
+            self._refresh_descriptor()
+            # Debounced in the coordinator: a host missing from the data only
+            # turns off once its consider-home window has passed
+            self._is_on = self.coordinator.is_present(self._mac)
 
         self.async_write_ha_state()
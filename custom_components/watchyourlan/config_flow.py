@@ -2,9 +2,12 @@
 Config flow for WatchYourLAN integration with dynamic removal of deselected devices.
 """
 import logging
+import math
+
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.components import webhook
 from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
@@ -17,11 +20,44 @@ from homeassistant.const import (
 
 # Import your existing constants. Adjust as needed.
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_AUTO_TRACK_KNOWN,
+    CONF_BREAKDOWN_SENSORS,
+    CONF_CONNECT_TIMEOUT,
+    CONF_CONSIDER_HOME,
+    CONF_EVENT_BATCH_THRESHOLD,
+    CONF_EXTRA_SERVERS,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MAX_STALE_AGE,
+    CONF_MIN_CONSECUTIVE_SEEN,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PRESENCE_OVERRIDES,
+    CONF_PUSH_UPDATES,
+    CONF_READ_TIMEOUT,
+    CONF_RECONCILE_INTERVAL,
+    CONF_SELECTIVE_FETCH,
+    CONF_TRACKING_RULES,
+    CONF_WEBHOOK_ID,
+    DEFAULT_BREAKDOWN_SENSORS,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_CONSIDER_HOME,
+    DEFAULT_EVENT_BATCH_THRESHOLD,
+    DEFAULT_MAX_STALE_AGE,
+    DEFAULT_MIN_CONSECUTIVE_SEEN,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_RECONCILE_INTERVAL,
+    DEVICE_PICKER_PAGE_SIZE,
     DOMAIN,
     DEFAULT_HOST,
     DEFAULT_PORT,
     DEFAULT_SCAN_INTERVAL,
+    MAX_TRACKING_RULES,
 )
+from .hosts import normalize_mac, parse_server_list
+from .maintenance import async_remove_host_devices
+from .polling import default_max_interval
+from .tracking import KNOWN_ANY, KNOWN_CHOICES, TrackingMatcher, build_rule, describe_rule
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -100,64 +136,363 @@ class WatchYourLANOptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry):
         """Initialize with the existing config entry."""
         self.config_entry = config_entry
+        # State of the device picker while it pages through matching hosts
+        self._pending = {}
+        self._matches = []
+        self._selection = set()
+        self._page = 0
 
     async def async_step_init(self, user_input=None):
+        """Let the user choose which group of options to edit."""
+        return self.async_show_menu(
+            step_id="init",
+            menu_options=["devices", "connection", "polling", "presence", "sensors"],
+        )
+
+    def _async_save_options(self, user_input):
+        """Merge the submitted fields into the existing options and save them."""
+        return self.async_create_entry(
+            title="", data={**self.config_entry.options, **user_input}
+        )
+
+    async def async_step_devices(self, user_input=None):
         """
-        Main step that displays a multi-select for devices (MAC addresses).
+        Filter the host table, then either pick matching hosts page by page
+        or save the filter as a tracking rule. Existing rules are listed so
+        they can be removed.
+
+        The form only ever carries the filter fields and the rules, so its
+        size does not depend on how many hosts the LAN has.
         """
+        options = self.config_entry.options
+        rules = list(options.get(CONF_TRACKING_RULES, []))
+        coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id]["coordinator"]
+        errors = {}
+
         if user_input is not None:
-            old_set = set(self.config_entry.options.get("devices_to_track", []))
-            new_set = set(user_input.get("devices_to_track", []))
+            kept = {int(index) for index in user_input.get(CONF_TRACKING_RULES, [])}
+            rules = [rule for index, rule in enumerate(rules) if index in kept]
+            self._pending = {
+                CONF_AUTO_TRACK_KNOWN: user_input.get(CONF_AUTO_TRACK_KNOWN, False),
+                CONF_TRACKING_RULES: rules,
+            }
+            action = user_input.get("action", "pick")
+            try:
+                rule = build_rule(
+                    user_input.get("name", ""),
+                    user_input.get("vendor", ""),
+                    user_input.get("iface", ""),
+                    user_input.get("known", KNOWN_ANY),
+                    user_input.get("mac_prefix", ""),
+                    user_input.get("ip_network", ""),
+                )
+            except ValueError:
+                errors["base"] = "invalid_rule"
+            else:
+                if action == "add_rule":
+                    if not rule:
+                        errors["base"] = "empty_rule"
+                    elif len(rules) >= MAX_TRACKING_RULES:
+                        errors["base"] = "too_many_rules"
+                    else:
+                        self._pending[CONF_TRACKING_RULES] = rules + [rule]
+                        return self._async_save_options(self._pending)
+                elif action == "pick":
+                    matches = TrackingMatcher([rule]).matches
+                    self._matches = sorted(
+                        mac
+                        for mac, host in coordinator.data.get("hosts_by_mac", {}).items()
+                        if matches(host)
+                    )
+                    self._selection = {
+                        normalize_mac(mac) for mac in options.get("devices_to_track", [])
+                    }
+                    self._page = 0
+                    return await self.async_step_devices_pick()
+                else:
+                    return self._async_save_options(self._pending)
+
+        ifaces = {"": "Any"}
+        ifaces.update(
+            (iface, iface) for iface in sorted(coordinator.stats.groups["iface"]) if iface
+        )
+        rule_choices = {str(index): describe_rule(rule) for index, rule in enumerate(rules)}
+
+        data_schema = vol.Schema({
+            vol.Optional("name", default=""): str,
+            vol.Optional("vendor", default=""): str,
+            vol.Optional("mac_prefix", default=""): str,
+            vol.Optional("ip_network", default=""): str,
+            vol.Optional("iface", default=""): vol.In(ifaces),
+            vol.Optional("known", default=KNOWN_ANY): vol.In(KNOWN_CHOICES),
+            vol.Optional("action", default="pick"): vol.In({
+                "pick": "Pick matching hosts",
+                "add_rule": "Track everything matching (save as rule)",
+                "save": "Only save the settings below",
+            }),
+            vol.Optional(
+                CONF_TRACKING_RULES, default=list(rule_choices)
+            ): cv.multi_select(rule_choices),
+            vol.Optional(
+                CONF_AUTO_TRACK_KNOWN,
+                default=options.get(CONF_AUTO_TRACK_KNOWN, False),
+            ): bool,
+        })
+
+        return self.async_show_form(
+            step_id="devices",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders={
+                "hosts": str(len(coordinator.data.get("hosts_by_mac", {}))),
+                "tracked": str(len(coordinator.tracked_macs)),
+            },
+        )
 
-            # Figure out which devices were removed from the selection
-            removed = old_set - new_set
+    async def async_step_devices_pick(self, user_input=None):
+        """
+        Step that displays one page of the filtered hosts as a multi-select.
+        Selections are collected across pages and saved after the last one.
+        """
+        coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id]["coordinator"]
+        start = self._page * DEVICE_PICKER_PAGE_SIZE
+        page = self._matches[start:start + DEVICE_PICKER_PAGE_SIZE]
+        more = start + DEVICE_PICKER_PAGE_SIZE < len(self._matches)
 
+        if user_input is not None:
+            self._selection.difference_update(page)
+            self._selection.update(user_input.get("devices_to_track", []))
+            if more and user_input.get("next_page"):
+                self._page += 1
+                return await self.async_step_devices_pick()
+
+            removed = {
+                normalize_mac(mac)
+                for mac in self.config_entry.options.get("devices_to_track", [])
+            } - self._selection
+            # Hosts that a rule still tracks keep their device
+            matcher = TrackingMatcher(self._pending_rules())
+            for mac in list(removed):
+                host = coordinator.get_host(mac)
+                if host is not None and matcher.matches(host):
+                    removed.discard(mac)
             if removed:
-                # Dynamically remove them from HA
-                await self._async_remove_devices(removed)
+                # Remove their devices (and entities) from HA in one pass
+                async_remove_host_devices(self.hass, self.config_entry, removed)
 
-            # Save the updated options
-            entry = self.async_create_entry(title="", data=user_input)
+            # Save the updated options; the entry's update listener adds and
+            # removes entities for the new selection without a reload
+            return self._async_save_options({
+                **self._pending,
+                "devices_to_track": sorted(self._selection),
+            })
 
-            # Force a reload so the integration picks up the new device set
-            await self.hass.config_entries.async_reload(self.config_entry.entry_id)
+        # Build a dict of MAC -> "Name (MAC)" for this page only
+        device_map = {}
+        for mac in page:
+            host = coordinator.get_host(mac)
+            name = (host.name if host else "") or mac
+            device_map[mac] = f"{name} ({mac})"
+
+        schema = {
+            vol.Optional(
+                "devices_to_track",
+                default=[mac for mac in page if mac in self._selection],
+            ): cv.multi_select(device_map),
+        }
+        if more:
+            schema[vol.Optional("next_page", default=True)] = bool
+
+        pages = max(1, math.ceil(len(self._matches) / DEVICE_PICKER_PAGE_SIZE))
+        return self.async_show_form(
+            step_id="devices_pick",
+            data_schema=vol.Schema(schema),
+            description_placeholders={
+                "matches": str(len(self._matches)),
+                "page": str(self._page + 1),
+                "pages": str(pages),
+            },
+        )
 
-            return entry
+    def _pending_rules(self):
+        """Return the rules being saved, including the auto-track-known rule."""
+        rules = list(self._pending[CONF_TRACKING_RULES])
+        if self._pending[CONF_AUTO_TRACK_KNOWN]:
+            rules.append({"known": True})
+        return rules
 
-        # If user_input is None, we show the form:
-        coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id]["coordinator"]
-        all_hosts = coordinator.data.get("hosts", [])
+    async def async_step_connection(self, user_input=None):
+        """Step for HTTP timeouts and additional servers to aggregate."""
+        errors = {}
+        if user_input is not None:
+            try:
+                parse_server_list(
+                    user_input.get(CONF_EXTRA_SERVERS, ""),
+                    self.config_entry.data[CONF_PORT],
+                )
+            except ValueError:
+                errors["base"] = "invalid_server"
+            else:
+                return self._async_save_options(user_input)
 
-        # Build a dict of MAC -> "Name (MAC)" for the multi_select
-        device_map = {}
-        for host in all_hosts:
-            mac = host.get("mac")
-            name = host.get("name") or mac
-            if mac:
-                device_map[mac] = f"{name} ({mac})"
+        options = self.config_entry.options
+        data_schema = vol.Schema({
+            vol.Optional(
+                CONF_CONNECT_TIMEOUT,
+                default=options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=120)),
+            vol.Optional(
+                CONF_READ_TIMEOUT,
+                default=options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+            vol.Optional(
+                CONF_EXTRA_SERVERS,
+                default=options.get(CONF_EXTRA_SERVERS, ""),
+            ): str,
+            vol.Optional(
+                CONF_MAX_STALE_AGE,
+                default=options.get(CONF_MAX_STALE_AGE, DEFAULT_MAX_STALE_AGE),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+        })
 
-        current_devices = self.config_entry.options.get("devices_to_track", [])
+        return self.async_show_form(
+            step_id="connection", data_schema=data_schema, errors=errors
+        )
+
+    async def async_step_polling(self, user_input=None):
+        """Step for adaptive polling and push updates."""
+        errors = {}
+        options = self.config_entry.options
+        if user_input is not None:
+            if user_input[CONF_MIN_SCAN_INTERVAL] > user_input[CONF_MAX_SCAN_INTERVAL]:
+                errors["base"] = "invalid_interval_range"
+            else:
+                if user_input[CONF_PUSH_UPDATES] and not options.get(CONF_WEBHOOK_ID):
+                    user_input[CONF_WEBHOOK_ID] = webhook.async_generate_id()
+                return self._async_save_options(user_input)
 
         data_schema = vol.Schema({
-            vol.Optional("devices_to_track", default=current_devices):
-                cv.multi_select(device_map)
+            vol.Optional(
+                CONF_ADAPTIVE_POLLING,
+                default=options.get(CONF_ADAPTIVE_POLLING, False),
+            ): bool,
+            vol.Optional(
+                CONF_MIN_SCAN_INTERVAL,
+                default=options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+            vol.Optional(
+                CONF_MAX_SCAN_INTERVAL,
+                default=options.get(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default_max_interval(self.config_entry.data[CONF_SCAN_INTERVAL]),
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
+            vol.Optional(
+                CONF_PUSH_UPDATES,
+                default=options.get(CONF_PUSH_UPDATES, False),
+            ): bool,
+            vol.Optional(
+                CONF_RECONCILE_INTERVAL,
+                default=options.get(CONF_RECONCILE_INTERVAL, DEFAULT_RECONCILE_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+            vol.Optional(
+                CONF_SELECTIVE_FETCH,
+                default=options.get(CONF_SELECTIVE_FETCH, False),
+            ): bool,
+            vol.Optional(
+                CONF_EVENT_BATCH_THRESHOLD,
+                default=options.get(
+                    CONF_EVENT_BATCH_THRESHOLD, DEFAULT_EVENT_BATCH_THRESHOLD
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10000)),
         })
 
-        return self.async_show_form(step_id="init", data_schema=data_schema)
+        webhook_url = "-"
+        if options.get(CONF_WEBHOOK_ID):
+            webhook_url = webhook.async_generate_url(self.hass, options[CONF_WEBHOOK_ID])
+
+        return self.async_show_form(
+            step_id="polling",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders={"webhook_url": webhook_url},
+        )
 
-    async def _async_remove_devices(self, removed_macs: set):
+    async def async_step_presence(self, user_input=None):
         """
-        Removes each deselected device from Home Assistant's device registry.
+        Step for presence debouncing: global defaults plus an optional
+        override for one tracked device per submission.
 
-        This also removes all entities associated with each device, so
-        they won't remain in the UI as 'unavailable'.
+        The device is entered as a MAC address rather than picked from a
+        list, so the form stays small however many hosts are tracked.
         """
-        import homeassistant.helpers.device_registry as dr
+        options = self.config_entry.options
+        overrides = dict(options.get(CONF_PRESENCE_OVERRIDES, {}))
+        coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id]["coordinator"]
+        errors = {}
 
-        device_registry = dr.async_get(self.hass)
+        if user_input is not None:
+            device = normalize_mac(user_input.pop("device", ""))
+            device_consider_home = user_input.pop("device_consider_home", None)
+            device_min_seen = user_input.pop("device_min_consecutive_seen", None)
+            # Tracked hosts can get an override; existing ones can be removed
+            if device and device not in coordinator.tracked_macs and device not in overrides:
+                errors["device"] = "unknown_device"
+            else:
+                if device:
+                    if device_consider_home is None and device_min_seen is None:
+                        overrides.pop(device, None)
+                    else:
+                        overrides[device] = {
+                            CONF_CONSIDER_HOME: device_consider_home,
+                            CONF_MIN_CONSECUTIVE_SEEN: device_min_seen,
+                        }
+                user_input[CONF_PRESENCE_OVERRIDES] = overrides
+                return self._async_save_options(user_input)
+
+        data_schema = vol.Schema({
+            vol.Optional(
+                CONF_CONSIDER_HOME,
+                default=options.get(CONF_CONSIDER_HOME, DEFAULT_CONSIDER_HOME),
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=86400)),
+            vol.Optional(
+                CONF_MIN_CONSECUTIVE_SEEN,
+                default=options.get(CONF_MIN_CONSECUTIVE_SEEN, DEFAULT_MIN_CONSECUTIVE_SEEN),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+            vol.Optional("device", default=""): str,
+            vol.Optional("device_consider_home"): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=86400)
+            ),
+            vol.Optional("device_min_consecutive_seen"): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=20)
+            ),
+        })
+
+        return self.async_show_form(
+            step_id="presence",
+            data_schema=data_schema,
+            errors=errors,
+            description_placeholders={
+                "overrides": ", ".join(sorted(overrides)) or "none",
+            },
+        )
+
+    async def async_step_sensors(self, user_input=None):
+        """Step for the per-interface/subnet/vendor breakdown sensors."""
+        if user_input is not None:
+            return self._async_save_options(user_input)
+
+        data_schema = vol.Schema({
+            vol.Optional(
+                CONF_BREAKDOWN_SENSORS,
+                default=self.config_entry.options.get(
+                    CONF_BREAKDOWN_SENSORS, DEFAULT_BREAKDOWN_SENSORS
+                ),
+            ): cv.multi_select({
+                "iface": "Interface",
+                "subnet": "Subnet (/24)",
+                "vendor": "Vendor",
+            }),
+        })
 
-        for mac in removed_macs:
-            device = device_registry.async_get_device(identifiers={(DOMAIN, mac)})
-            if device:
-                _LOGGER.info("Removing device with MAC %s from device registry", mac)
-                device_registry.async_remove_device(device.id)
+        return self.async_show_form(step_id="sensors", data_schema=data_schema)
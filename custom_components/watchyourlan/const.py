@@ -9,3 +9,100 @@ ICON = "mdi:lan"
 DEFAULT_HOST = "localhost"
 DEFAULT_PORT = 8840
 DEFAULT_SCAN_INTERVAL = 60  # seconds
+
+# Connection pooling / timeouts
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_READ_TIMEOUT = "read_timeout"
+DEFAULT_CONNECT_TIMEOUT = 5  # seconds
+DEFAULT_READ_TIMEOUT = 10  # seconds
+CONNECTION_LIMIT_PER_HOST = 4
+KEEPALIVE_TIMEOUT = 120  # seconds
+
+# Number of recent polls kept for the timing diagnostics
+METRICS_WINDOW = 100
+
+# Bodies at least this large are decoded and normalized in the executor
+PARSE_IN_EXECUTOR_BYTES = 256 * 1024
+
+# Adaptive polling
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+DEFAULT_MIN_SCAN_INTERVAL = 10  # seconds
+DEFAULT_MAX_SCAN_INTERVAL = 300  # seconds, capped at the entry's scan interval
+POLL_BACKOFF_FACTOR = 2.0
+
+# Push updates through a Home Assistant webhook
+CONF_PUSH_UPDATES = "push_updates"
+CONF_RECONCILE_INTERVAL = "reconcile_interval"
+CONF_WEBHOOK_ID = "webhook_id"
+DEFAULT_RECONCILE_INTERVAL = 600  # seconds
+
+# Selective per-host fetching of tracked devices
+CONF_SELECTIVE_FETCH = "selective_fetch"
+FULL_SYNC_INTERVAL = 600  # seconds between full /api/all syncs in selective mode
+SELECTIVE_FETCH_CONCURRENCY = 8
+SELECTIVE_MAX_TRACKED_RATIO = 0.25
+
+# Persistent host snapshot
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 60  # seconds
+
+# Presence history
+HISTORY_TRANSITIONS_PER_HOST = 32
+HISTORY_WINDOW = 24 * 3600  # seconds
+
+# Presence debouncing
+CONF_CONSIDER_HOME = "consider_home"
+CONF_MIN_CONSECUTIVE_SEEN = "min_consecutive_seen"
+CONF_PRESENCE_OVERRIDES = "presence_overrides"
+DEFAULT_CONSIDER_HOME = 0  # seconds
+DEFAULT_MIN_CONSECUTIVE_SEEN = 1
+
+# Entity lifecycle
+CONF_AUTO_TRACK_KNOWN = "auto_track_known"
+
+# Aggregating several WatchYourLAN servers
+CONF_EXTRA_SERVERS = "extra_servers"
+
+# Tracking rules and the paged device picker
+CONF_TRACKING_RULES = "tracking_rules"
+MAX_TRACKING_RULES = 32
+DEVICE_PICKER_PAGE_SIZE = 50
+
+# Fetch resilience
+CONF_MAX_STALE_AGE = "max_stale_age"
+DEFAULT_MAX_STALE_AGE = 900  # seconds; 0 turns stale-data serving off
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 0.5  # seconds
+RETRY_MAX_DELAY = 4  # seconds
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN = 30  # seconds
+BREAKER_MAX_COOLDOWN = 600  # seconds
+
+HEALTH_OK = "ok"
+HEALTH_DEGRADED = "degraded"
+HEALTH_STALE = "stale"
+HEALTH_DOWN = "down"
+
+# Device registry maintenance
+DEVICE_PRUNE_INTERVAL = timedelta(hours=6)
+SERVICE_PRUNE_DEVICES = "prune_devices"
+
+# Host events on the HA bus
+EVENT_HOST_NEW = "watchyourlan_host_new"
+EVENT_HOST_ONLINE = "watchyourlan_host_online"
+EVENT_HOST_OFFLINE = "watchyourlan_host_offline"
+EVENT_HOST_IP_CHANGED = "watchyourlan_host_ip_changed"
+EVENT_HOST_BATCH = "watchyourlan_host_batch"
+CONF_EVENT_BATCH_THRESHOLD = "event_batch_threshold"
+DEFAULT_EVENT_BATCH_THRESHOLD = 20
+
+# Per-group breakdown sensors
+CONF_BREAKDOWN_SENSORS = "breakdown_sensors"
+DEFAULT_BREAKDOWN_SENSORS = ["iface", "subnet"]
+MAX_GROUP_SENSORS = 32  # per grouping field
+
+# Inventory export
+SERVICE_EXPORT_INVENTORY = "export_inventory"
+EXPORT_FORMATS = ("csv", "jsonl")
@@ -0,0 +1,749 @@
+"""Data update coordinator for the WatchYourLAN integration."""
+import asyncio
+import logging
+import math
+import time
+from datetime import timedelta
+
+import aiohttp
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+
+from .api import NOT_MODIFIED, WatchYourLANClient, build_timeout, json_loads
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_AUTO_TRACK_KNOWN,
+    CONF_CONNECT_TIMEOUT,
+    CONF_EVENT_BATCH_THRESHOLD,
+    CONF_EXTRA_SERVERS,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MAX_STALE_AGE,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PUSH_UPDATES,
+    CONF_READ_TIMEOUT,
+    CONF_RECONCILE_INTERVAL,
+    CONF_SELECTIVE_FETCH,
+    CONF_TRACKING_RULES,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_EVENT_BATCH_THRESHOLD,
+    BREAKER_COOLDOWN,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_COOLDOWN,
+    DEFAULT_MAX_STALE_AGE,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_RECONCILE_INTERVAL,
+    FULL_SYNC_INTERVAL,
+    HEALTH_DEGRADED,
+    HEALTH_DOWN,
+    HEALTH_OK,
+    HEALTH_STALE,
+    PARSE_IN_EXECUTOR_BYTES,
+    POLL_BACKOFF_FACTOR,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    SELECTIVE_FETCH_CONCURRENCY,
+    SELECTIVE_MAX_TRACKED_RATIO,
+)
+from .hosts import (
+    HostDiff,
+    HostStats,
+    build_hosts,
+    diff_hosts,
+    merge_host,
+    merge_host_tables,
+    normalize_mac,
+    parse_server_list,
+)
+from .entity import HostDescriptorCache
+from .events import async_fire_host_events, build_host_events
+from .history import PresenceHistory
+from .metrics import PollMetrics
+from .polling import AdaptiveInterval, default_max_interval
+from .presence import build_debouncer
+from .resilience import CircuitBreaker, CircuitOpenError, async_retry
+from .snapshot import HostSnapshotStore
+from .tracking import TrackingMatcher
+
+_LOGGER = logging.getLogger(__name__)
+
+# Options that can be applied to a running coordinator without a reload
+LIVE_OPTIONS = frozenset(("devices_to_track", CONF_AUTO_TRACK_KNOWN, CONF_TRACKING_RULES))
+
+
+class WatchYourLANCoordinator(DataUpdateCoordinator):
+    """DataUpdateCoordinator to fetch data from WatchYourLAN's API."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        entry: ConfigEntry,
+    ):
+        """Initialize the coordinator."""
+        options = entry.options
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="WatchYourLAN",
+            update_interval=timedelta(seconds=entry.data["scan_interval"]),
+            # Returning the previous data object skips listener dispatch
+            always_update=False,
+        )
+        self.entry = entry
+        connect_timeout = options.get(CONF_CONNECT_TIMEOUT, DEFAULT_CONNECT_TIMEOUT)
+        read_timeout = options.get(CONF_READ_TIMEOUT, DEFAULT_READ_TIMEOUT)
+        timeout = build_timeout(connect_timeout, read_timeout)
+        servers = [(entry.data["host"], entry.data["port"])] + parse_server_list(
+            options.get(CONF_EXTRA_SERVERS, ""), entry.data["port"]
+        )
+        # The first client is the entry's own server; any others are aggregated
+        self._clients = [
+            WatchYourLANClient(session, host, port, timeout) for host, port in servers
+        ]
+        # Upper bound for one server's poll, so a slow server can't stall the rest
+        self._server_timeout = connect_timeout + read_timeout
+        # Last good host list per server, reused when that server fails
+        self._server_hosts = {}
+        self.breakers = {
+            client.base_url: CircuitBreaker(
+                BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN, BREAKER_MAX_COOLDOWN
+            )
+            for client in self._clients
+        }
+        # Servers that failed in the most recent poll
+        self._failed_servers = set()
+        # How long the last good table may be served while polls fail
+        self._max_stale_age = options.get(CONF_MAX_STALE_AGE, DEFAULT_MAX_STALE_AGE)
+        self._event_batch_threshold = options.get(
+            CONF_EVENT_BATCH_THRESHOLD, DEFAULT_EVENT_BATCH_THRESHOLD
+        )
+        self._last_success = None
+        self.last_success_time = None
+        self.health = HEALTH_OK
+        self._adaptive = None
+        if options.get(CONF_PUSH_UPDATES, False):
+            # Pushed events keep the table current; polling only reconciles
+            self.update_interval = timedelta(
+                seconds=options.get(CONF_RECONCILE_INTERVAL, DEFAULT_RECONCILE_INTERVAL)
+            )
+        elif options.get(CONF_ADAPTIVE_POLLING, False):
+            self._adaptive = AdaptiveInterval(
+                options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL),
+                options.get(
+                    CONF_MAX_SCAN_INTERVAL,
+                    default_max_interval(entry.data["scan_interval"]),
+                ),
+                POLL_BACKOFF_FACTOR,
+            )
+            self.update_interval = self._adaptive.interval
+        self._options = dict(options)
+        # Shared device info/attributes per tracked host
+        self.descriptors = HostDescriptorCache(entry.entry_id)
+        # Tracked hosts: the explicit selection plus every host matching a
+        # tracking rule ("track every known host" is just another rule)
+        self._explicit_tracked = frozenset()
+        self._matcher = TrackingMatcher()
+        self._rule_tracked = set()
+        self.tracked_macs = frozenset()
+        # Bumped whenever tracked_macs changes, so platforms know to resync
+        self.tracking_revision = 0
+        self._set_tracking(options)
+        self._selective_fetch = options.get(CONF_SELECTIVE_FETCH, False)
+        self._last_full_sync = None
+        # Exponential moving averages of request latency, in seconds
+        self._bulk_latency = None
+        self._host_latency = None
+        # True once push or selective updates made the table newer than
+        # the last /api/all body, which then must not count as "not modified"
+        self._table_patched = False
+        # What changed in the most recent refresh; None until the first one
+        self.last_diff = None
+        # Hub counters, updated from each diff rather than recomputed
+        self.stats = HostStats()
+        self.snapshot = HostSnapshotStore(hass, entry.entry_id)
+        self.history = PresenceHistory()
+        self.metrics = PollMetrics()
+        # Called after every poll, see async_add_poll_listener
+        self._poll_listeners = []
+        # Debounced presence; one timer serves every host's grace window
+        self.presence = build_debouncer(options)
+        self._presence_flips = []
+        self._presence_revision = 0
+        self._presence_unsub = None
+
+    async def async_restore_snapshot(self) -> bool:
+        """
+        Seed the table from the persisted snapshot, before any listeners
+        exist. Returns True if cached hosts were loaded.
+        """
+        hosts = await self.snapshot.async_load()
+        if not hosts:
+            return False
+
+        hosts, index = build_hosts(
+            (host.as_dict() for host in hosts), normalized=True
+        )
+        self._apply_diff(diff_hosts(None, index), {}, index)
+        self.data = {"hosts": hosts, "hosts_by_mac": index}
+        # The cache may be older than anything the server would call current
+        self._table_patched = True
+        return True
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners, timing the entity fan-out."""
+        started = time.perf_counter()
+        super().async_update_listeners()
+        self.metrics.record("dispatch", time.perf_counter() - started)
+
+    def _apply_diff(self, diff, previous, current):
+        """Publish a diff and fold it into the stats and presence history."""
+        started = time.perf_counter()
+        try:
+            self._apply_diff_inner(diff, previous, current)
+        finally:
+            self.metrics.record("diff", time.perf_counter() - started)
+
+    def _apply_diff_inner(self, diff, previous, current):
+        self.last_diff = diff
+        if not diff:
+            return
+        self.stats.apply_diff(diff, previous, current)
+        if previous:
+            # Not on the first table (or the restored one): everything is "new" there
+            async_fire_host_events(
+                self.hass,
+                self.entry.entry_id,
+                build_host_events(diff, previous, current),
+                self._event_batch_threshold,
+            )
+
+        matcher = self._matcher
+        if matcher:
+            # Only hosts that are new or changed in a field a rule looks at
+            for mac in diff.added:
+                if matcher.matches(current[mac]):
+                    self._rule_tracked.add(mac)
+            for mac, fields in diff.changed.items():
+                if fields & matcher.fields:
+                    if matcher.matches(current[mac]):
+                        self._rule_tracked.add(mac)
+                    else:
+                        self._rule_tracked.discard(mac)
+            self._update_tracked()
+
+        now = time.time()
+        monotonic = time.monotonic()
+        for mac in diff.removed:
+            self.history.forget(mac)
+            self._observe_presence(mac, False, monotonic)
+        for mac in diff.added:
+            self.history.record(mac, current[mac].online, now)
+            self._observe_presence(mac, current[mac].online, monotonic)
+        for mac, fields in diff.changed.items():
+            if "online" in fields:
+                self.history.record(mac, current[mac].online, now)
+                self._observe_presence(mac, current[mac].online, monotonic)
+
+    def _observe_presence(self, mac, online, now):
+        if self.presence.observe(mac, online, now):
+            self._presence_flips.append(mac)
+
+    def _publish_presence_flips(self, data):
+        """
+        Fold debounced presence flips into last_diff and return data that
+        compares unequal to the previous data, so listeners get dispatched
+        even when the host table itself did not change.
+        """
+        flips, self._presence_flips = self._presence_flips, []
+        # Removed hosts are away as of this data; forgetting them now looks
+        # the same to entities and keeps the debouncer from growing with
+        # every MAC ever seen. The timer forgets those still in grace.
+        index = data["hosts_by_mac"]
+        for mac in self.last_diff.removed:
+            if mac not in index and not self.presence.is_pending(mac):
+                self.presence.forget(mac)
+        self._async_schedule_presence_timer()
+        if not flips:
+            return data
+        self.last_diff = self.last_diff.with_changes(flips, "present")
+        self._presence_revision += 1
+        return {**data, "presence_revision": self._presence_revision}
+
+    @callback
+    def _async_schedule_presence_timer(self):
+        """(Re)arm the single timer for the earliest pending grace window."""
+        if self._presence_unsub is not None:
+            self._presence_unsub()
+            self._presence_unsub = None
+        deadline = self.presence.next_deadline()
+        if deadline is not None:
+            self._presence_unsub = async_call_later(
+                self.hass,
+                max(0.0, deadline - time.monotonic()),
+                self._async_presence_timer,
+            )
+
+    @callback
+    def _async_presence_timer(self, _now):
+        """Mark hosts whose grace window ran out as away."""
+        self._presence_unsub = None
+        expired = self.presence.expire(time.monotonic())
+        index = self.data.get("hosts_by_mac", {}) if self.data else {}
+        for mac in expired:
+            if mac not in index:
+                self.presence.forget(mac)
+        if expired:
+            self.last_diff = HostDiff().with_changes(expired, "present")
+            self.async_update_listeners()
+        self._async_schedule_presence_timer()
+
+    @callback
+    def async_stop_presence_timer(self):
+        """Cancel the presence timer when the entry unloads."""
+        if self._presence_unsub is not None:
+            self._presence_unsub()
+            self._presence_unsub = None
+
+    @callback
+    def _async_table_changed(self):
+        """Persist the table (debounced) after it changed."""
+        self.snapshot.async_schedule_save(lambda: self.data["hosts"])
+
+    def _set_tracking(self, options):
+        """Recompute the tracked set from the options and the current table."""
+        self._explicit_tracked = frozenset(
+            normalize_mac(mac) for mac in options.get("devices_to_track", [])
+        )
+        rules = list(options.get(CONF_TRACKING_RULES, []))
+        if options.get(CONF_AUTO_TRACK_KNOWN, False):
+            rules.append({"known": True})
+        self._matcher = TrackingMatcher(rules)
+        self._rule_tracked = set()
+        if self._matcher and self.data:
+            matches = self._matcher.matches
+            self._rule_tracked = {
+                mac for mac, host in self.data["hosts_by_mac"].items() if matches(host)
+            }
+        self._update_tracked()
+
+    def _update_tracked(self):
+        tracked = self._explicit_tracked | self._rule_tracked
+        if tracked != self.tracked_macs:
+            self.tracked_macs = frozenset(tracked)
+            self.tracking_revision += 1
+            self.descriptors.retain(self.tracked_macs)
+
+    @callback
+    def async_apply_options(self, options) -> bool:
+        """
+        Apply changed options to the running coordinator. Returns False if
+        anything besides the tracked devices changed, i.e. a reload is needed.
+        """
+        changed = {
+            key for key in options.keys() | self._options.keys()
+            if options.get(key) != self._options.get(key)
+        }
+        if changed - LIVE_OPTIONS:
+            return False
+        self._options = dict(options)
+        self._set_tracking(options)
+        # Let the platforms add/remove entities; no host changed
+        self.last_diff = HostDiff()
+        self.async_update_listeners()
+        return True
+
+    def is_present(self, mac) -> bool:
+        """Return the debounced presence of a host."""
+        return self.presence.is_present(normalize_mac(mac))
+
+    def get_host(self, mac):
+        """Return the latest host record for a MAC address, or None."""
+        if not self.data:
+            return None
+        return self.data.get("hosts_by_mac", {}).get(normalize_mac(mac))
+
+    @callback
+    def async_apply_host_events(self, events) -> int:
+        """
+        Apply pushed host events to the current table as deltas.
+
+        Each event is a full or partial host record keyed by its MAC. Only
+        the affected entities are notified. Returns the number of hosts
+        that changed.
+        """
+        if not self.data:
+            return 0
+
+        data = self._publish_presence_flips(self._merge_events(events))
+        if data is self.data:
+            return 0
+
+        # Not async_set_updated_data: that would reschedule the next poll,
+        # and a LAN that pushes often would never be reconciled
+        self.data = data
+        self.async_update_listeners()
+        self._async_table_changed()
+        return len(self.last_diff.added) + len(self.last_diff.changed)
+
+    def _merge_events(self, events) -> dict:
+        """
+        Merge host events into a copy of the current table, updating
+        last_diff and the stats. Returns the current data unchanged if
+        the events did not change anything.
+        """
+        previous = self.data["hosts_by_mac"]
+        index = dict(previous)
+        for event in events:
+            mac = normalize_mac(event.get("mac") or event.get("Mac"))
+            if mac:
+                index[mac] = merge_host(index.get(mac), event)
+
+        diff = diff_hosts(previous, index)
+        self._apply_diff(diff, previous, index)
+        if not diff:
+            return self.data
+
+        self._table_patched = True
+        return {**self.data, "hosts": list(index.values()), "hosts_by_mac": index}
+
+    @callback
+    def async_add_poll_listener(self, update_callback) -> CALLBACK_TYPE:
+        """
+        Listen for the end of every poll, whether or not it changed the data.
+        Regular listeners are skipped for unchanged polls (always_update=False).
+        """
+        self._poll_listeners.append(update_callback)
+
+        @callback
+        def _remove():
+            self._poll_listeners.remove(update_callback)
+
+        return _remove
+
+    @callback
+    def _async_poll_finished(self):
+        for update_callback in list(self._poll_listeners):
+            update_callback()
+
+    async def _async_update_data(self) -> dict:
+        try:
+            return await self._async_update()
+        finally:
+            # Runs after the coordinator has dispatched (or skipped) the result
+            self.hass.loop.call_soon(self._async_poll_finished)
+
+    async def _async_update(self) -> dict:
+        """Poll WatchYourLAN and adapt the next interval to what was seen."""
+        initial = self.data is None
+        started = time.perf_counter()
+        try:
+            data = await self._async_poll()
+        except UpdateFailed as err:
+            if self._adaptive is not None:
+                self._adaptive.record_quiet()
+                self.update_interval = self._adaptive.interval
+            return self._serve_stale(err)
+
+        self._last_success = time.monotonic()
+        self.last_success_time = dt_util.utcnow()
+        self._set_health(HEALTH_DEGRADED if self._failed_servers else HEALTH_OK)
+
+        if self.last_diff:
+            self._async_table_changed()
+
+        # Hosts waiting for N consecutive sightings count every poll, even
+        # ones where the table did not change.
+        monotonic = time.monotonic()
+        index = data["hosts_by_mac"]
+        for mac in self.presence.arming():
+            if not self.last_diff.touches(mac) and mac in index and index[mac].online:
+                self._observe_presence(mac, True, monotonic)
+        data = self._publish_presence_flips(data)
+        self.metrics.record("poll", time.perf_counter() - started)
+
+        if self._adaptive is not None and not initial:
+            if self.last_diff.presence_changed():
+                self._adaptive.record_change()
+            else:
+                self._adaptive.record_quiet()
+            self.update_interval = self._adaptive.interval
+        return self._with_health(data)
+
+    def _set_health(self, health):
+        if health != self.health:
+            _LOGGER.info("WatchYourLAN health changed from %s to %s", self.health, health)
+            self.health = health
+
+    def _with_health(self, data) -> dict:
+        """
+        Return data carrying the current health, copying it only when the
+        health changed so a transition still reaches the listeners.
+        """
+        if data.get("health") == self.health:
+            return data
+        return {**data, "health": self.health}
+
+    def _serve_stale(self, err) -> dict:
+        """
+        Keep serving the last good table after a failed poll, as long as it
+        is not older than the configured maximum age; otherwise re-raise.
+        """
+        if (
+            self.data is None
+            or self._last_success is None
+            or time.monotonic() - self._last_success > self._max_stale_age
+        ):
+            self._set_health(HEALTH_DOWN)
+            raise err
+        _LOGGER.debug("Serving stale WatchYourLAN data: %s", err)
+        self._set_health(HEALTH_STALE)
+        return self._with_health(self.data)
+
+    async def _async_fetch_all(self, client, conditional):
+        """
+        Fetch /api/all from one server through its circuit breaker, retrying
+        transient errors with jittered backoff.
+        """
+        breaker = self.breakers[client.base_url]
+        if not breaker.allow_request():
+            self._failed_servers.add(client.base_url)
+            raise CircuitOpenError(f"Circuit open for {client.base_url}")
+        try:
+            # One budget for all attempts, so a dead server can't hold up
+            # the other servers' results for several timeouts in a row
+            body = await asyncio.wait_for(
+                async_retry(
+                    lambda: client.async_get_all(conditional=conditional),
+                    RETRY_ATTEMPTS,
+                    RETRY_BASE_DELAY,
+                    RETRY_MAX_DELAY,
+                ),
+                self._server_timeout,
+            )
+        except Exception:
+            breaker.record_failure()
+            self._failed_servers.add(client.base_url)
+            raise
+        breaker.record_success()
+        return body
+
+    async def _async_poll(self) -> dict:
+        """Fetch the latest data and work out which hosts changed."""
+        # A failed or unchanged refresh still has to report "nothing changed".
+        self.last_diff = HostDiff()
+        self._failed_servers = set()
+        if self._use_selective_fetch():
+            return await self._async_poll_selective()
+        return await self._async_poll_bulk()
+
+    def _use_selective_fetch(self) -> bool:
+        """
+        Decide whether this poll may fetch only the tracked hosts.
+
+        Selective polls are used between periodic full syncs when few of
+        the hosts are tracked and, once latencies have been measured, when
+        fetching them one by one is expected to beat one bulk request.
+        """
+        if not self._selective_fetch or not self.data or not self.tracked_macs:
+            return False
+        if len(self._clients) > 1:
+            # Host ids are per server, so aggregated tables always go bulk
+            return False
+        if (
+            self._last_full_sync is None
+            or time.monotonic() - self._last_full_sync >= FULL_SYNC_INTERVAL
+        ):
+            return False
+        if len(self.tracked_macs) > self.stats.total * SELECTIVE_MAX_TRACKED_RATIO:
+            return False
+        if self._bulk_latency is not None and self._host_latency is not None:
+            rounds = math.ceil(len(self.tracked_macs) / SELECTIVE_FETCH_CONCURRENCY)
+            if rounds * self._host_latency > self._bulk_latency:
+                return False
+        return True
+
+    async def _async_poll_selective(self) -> dict:
+        """Fetch only the tracked hosts through the per-host endpoint."""
+        index = self.data["hosts_by_mac"]
+        targets = [
+            index[mac] for mac in self.tracked_macs
+            if mac in index and index[mac].id is not None
+        ]
+        breaker = self.breakers[self._clients[0].base_url]
+        if not breaker.allow_request():
+            raise UpdateFailed("WatchYourLAN is unreachable, waiting before retrying")
+        semaphore = asyncio.Semaphore(SELECTIVE_FETCH_CONCURRENCY)
+
+        async def _async_fetch_one(host):
+            async with semaphore:
+                started = time.monotonic()
+                record = await self._clients[0].async_get_host(host.id)
+                self._host_latency = _ema(self._host_latency, time.monotonic() - started)
+                return record
+
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(_async_fetch_one(host) for host in targets), return_exceptions=True
+        )
+        self.metrics.record("fetch", time.perf_counter() - started)
+        events = []
+        for host, result in zip(targets, results):
+            if isinstance(result, Exception):
+                _LOGGER.debug("Failed to fetch WatchYourLAN host %s: %s", host.mac, result)
+                continue
+            # Key the record by the MAC we asked for in case it is missing
+            events.append({**result, "mac": host.mac})
+
+        if targets and not events:
+            breaker.record_failure()
+            raise UpdateFailed("Error communicating with WatchYourLAN: all host requests failed")
+        breaker.record_success()
+        return self._merge_events(events)
+
+    async def _async_poll_bulk(self) -> dict:
+        """Fetch every host through /api/all."""
+        if len(self._clients) > 1:
+            return await self._async_poll_aggregated()
+
+        started = time.monotonic()
+        try:
+            body = await self._async_fetch_all(
+                self._clients[0], self.data is not None and not self._table_patched
+            )
+        except Exception as err:
+            raise UpdateFailed(f"Error communicating with WatchYourLAN: {err}") from err
+        elapsed = time.monotonic() - started
+        self.metrics.record("fetch", elapsed)
+        self._bulk_latency = _ema(self._bulk_latency, elapsed)
+        self._last_full_sync = time.monotonic()
+        self._table_patched = False
+
+        if body is NOT_MODIFIED:
+            # Same object as before, so the coordinator skips entity dispatch
+            return self.data
+
+        previous = self.data.get("hosts_by_mac") if self.data else None
+        data = await self._async_decode(body, previous)
+        self._clients[0].commit_validators()
+
+        # Diff against the table as it is now: a push handled while the body
+        # was decoded has already folded its own changes into the stats
+        previous = self.data.get("hosts_by_mac") if self.data else None
+        current = data["hosts_by_mac"]
+        self._apply_diff(diff_hosts(previous, current), previous or {}, current)
+        return data
+
+    async def _async_poll_aggregated(self) -> dict:
+        """
+        Fetch /api/all from every configured server concurrently and merge
+        the results by MAC. A server that fails or times out contributes
+        its last good host list; the poll only fails if every server does.
+        """
+        conditional = self.data is not None and not self._table_patched
+
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(self._async_fetch_all(client, conditional) for client in self._clients),
+            return_exceptions=True,
+        )
+        elapsed = time.monotonic() - started
+        self.metrics.record("fetch", elapsed)
+        self._bulk_latency = _ema(self._bulk_latency, elapsed)
+
+        previous = self.data.get("hosts_by_mac") if self.data else None
+        failures = 0
+        updated = False
+        for client, result in zip(self._clients, results):
+            if isinstance(result, BaseException):
+                failures += 1
+                _LOGGER.warning(
+                    "WatchYourLAN server %s failed, using its last data: %s",
+                    client.base_url, result or type(result).__name__,
+                )
+                continue
+            if result is NOT_MODIFIED:
+                continue
+            try:
+                data = await self._async_decode(result, previous)
+            except UpdateFailed as err:
+                # A bad body counts as that server failing, not the whole poll
+                failures += 1
+                self._failed_servers.add(client.base_url)
+                self.breakers[client.base_url].record_failure()
+                _LOGGER.warning(
+                    "WatchYourLAN server %s sent invalid data, using its last data: %s",
+                    client.base_url, err,
+                )
+                continue
+            client.commit_validators()
+            self._server_hosts[client.base_url] = data["hosts"]
+            updated = True
+
+        if failures == len(self._clients):
+            raise UpdateFailed("Error communicating with WatchYourLAN: all servers failed")
+
+        self._last_full_sync = time.monotonic()
+        self._table_patched = False
+        if not updated and self.data is not None:
+            return self.data
+
+        hosts, current = merge_host_tables(
+            self._server_hosts.get(client.base_url, ()) for client in self._clients
+        )
+        # Pushes may have changed the table while bodies were being decoded
+        previous = self.data.get("hosts_by_mac") if self.data else None
+        self._apply_diff(diff_hosts(previous, current), previous or {}, current)
+        return {"hosts": hosts, "hosts_by_mac": current}
+
+    async def _async_decode(self, body: bytes, previous) -> dict:
+        """Decode a body, in the executor if it is large."""
+        self.metrics.payload_bytes = len(body)
+        if len(body) >= PARSE_IN_EXECUTOR_BYTES:
+            # Big LANs: keep JSON decoding and normalization off the event loop
+            return await self.hass.async_add_executor_job(
+                self._decode, body, previous
+            )
+        return self._decode(body, previous)
+
+    def _decode(self, body: bytes, previous) -> dict:
+        """
+        Decode and normalize an /api/all body into the coordinator's data.
+
+        May run in the executor; it only reads the previous index.
+        """
+        started = time.perf_counter()
+        try:
+            payload = json_loads(body)
+        except ValueError as err:
+            raise UpdateFailed(f"Invalid JSON from WatchYourLAN: {err}") from err
+        parsed = time.perf_counter()
+        self.metrics.record("parse", parsed - started)
+
+        if isinstance(payload, list):
+            hosts, index = build_hosts(payload, previous)
+            data = {"hosts": hosts, "hosts_by_mac": index}
+        elif isinstance(payload, dict):
+            hosts, index = build_hosts(
+                payload.get("hosts") or [], previous, normalized=True
+            )
+            data = {**payload, "hosts": hosts, "hosts_by_mac": index}
+        else:
+            raise UpdateFailed(f"Invalid JSON structure: {payload}")
+        self.metrics.record("normalize", time.perf_counter() - parsed)
+        return data
+
+
+def _ema(average, sample, weight=0.2):
+    """Fold a new latency sample into an exponential moving average."""
+    if average is None:
+        return sample
+    return average + weight * (sample - average)
@@ -5,9 +5,9 @@ from homeassistant.components.device_tracker.config_entry import ScannerEntity
 from homeassistant.components.device_tracker.const import SourceType
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
+from .entity import WatchYourLANHostEntity, async_setup_host_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,38 +17,29 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     entry_id = entry.entry_id
 
-    # The user-chosen MACs (the devices they want to see in HA)
-    chosen_macs = entry.options.get("devices_to_track", [])
+    # One child device per tracked host; entities follow the tracked set
+    # (options and auto-tracking) without reloading the entry.
+    async_setup_host_entities(
+        hass,
+        entry,
+        coordinator,
+        async_add_entities,
+        lambda host: WatchYourLANHostDeviceTracker(coordinator, entry_id, host),
+    )
 
-    entities = []
-    data = coordinator.data
-    if data and "hosts" in data:
-        for host in data["hosts"]:
-            mac = host.get("mac")
-            if mac and mac in chosen_macs:
-                # Create a child device for this host
-                entities.append(WatchYourLANHostDeviceTracker(coordinator, entry_id, host))
 
-    async_add_entities(entities, True)
-
-
-class WatchYourLANHostDeviceTracker(CoordinatorEntity, ScannerEntity):
+class WatchYourLANHostDeviceTracker(WatchYourLANHostEntity, ScannerEntity):
     """Device tracker for each selected host, represented as a separate device."""
 
     def __init__(self, coordinator, entry_id, host_data):
-        super().__init__(coordinator)
+        super().__init__(coordinator, host_data)
         self._entry_id = entry_id
-        self._host_id = host_data.get("id")
-        self._mac = host_data.get("mac")
-        self._ip = host_data.get("ip")
-        self._known = host_data.get("known", False)
-        self._vendor = host_data.get("vendor", "")
-        self._name = host_data.get("name") or host_data.get("mac")
-        self._is_connected = host_data.get("online", False)
+        self._mac = host_data.mac
+        self._is_connected = coordinator.is_present(host_data.mac)
 
     @property
     def name(self):
-        return f"WatchYourLAN Tracker {self._name}"
+        return f"WatchYourLAN Tracker {self._descriptor.name}"
 
     @property
     def unique_id(self):
@@ -68,48 +59,25 @@ class WatchYourLANHostDeviceTracker(CoordinatorEntity, ScannerEntity):
     @property
     def ip_address(self):
         """The IP address of the host."""
-        return self._ip
+        return self._descriptor.host.ip
 
     @property
     def mac_address(self):
         """The MAC address of the host."""
         return self._mac
 
-    @property
-    def device_info(self):
-        """
-        Make each tracked host a child device of the main 'hub'.
-        Use (DOMAIN, self._mac) as the unique identifier for the child device.
-        'via_device': tie it back to the aggregator/hub device (DOMAIN, entry_id).
-        """
-        return {
-            "identifiers": {(DOMAIN, self._mac)},
-            "name": self._name,
-            "manufacturer": self._vendor or "Unknown",
-            "model": "Tracked Host",
-            "via_device": (DOMAIN, self._entry_id),
-        }
-
     @property
     def extra_state_attributes(self):
-        """Provide any additional attributes."""
-        return {
-            "host_id": self._host_id,
-            "known": self._known,
-            "vendor": self._vendor,
-        }
+        """Host details, shared with the presence binary sensor."""
+        return self._descriptor.attributes
 
     @callback
     def _handle_coordinator_update(self):
         """Update from coordinator data."""
-        for host in self.coordinator.data.get("hosts", []):
-            if host.get("mac") == self._mac:
-                self._is_connected = host.get("online", False)
-                self._ip = host.get("ip")
-                self._known = host.get("known", False)
-                new_name = host.get("name")
-                if new_name and new_name != self._mac and new_name != self._name:
-                    self._name = new_name
-                break
+        if not self._host_update_pending():
+            return
+
+        self._refresh_descriptor()
+        self._is_connected = self.coordinator.is_present(self._mac)
 
         self.async_write_ha_state()
@@ -0,0 +1,55 @@
+"""Diagnostics support for WatchYourLAN."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_EXTRA_SERVERS,
+    CONF_PRESENCE_OVERRIDES,
+    CONF_TRACKING_RULES,
+    CONF_WEBHOOK_ID,
+    DOMAIN,
+)
+
+# Options that name hosts, addresses or the webhook
+TO_REDACT = {
+    CONF_WEBHOOK_ID,
+    CONF_EXTRA_SERVERS,
+    CONF_PRESENCE_OVERRIDES,
+    CONF_TRACKING_RULES,
+    "devices_to_track",
+}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """
+    Return timings, payload size and counts for a config entry. The host
+    table itself is left out: it lists every MAC, IP and hostname on the LAN.
+    """
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    stats = coordinator.stats
+    data = coordinator.data or {}
+
+    return {
+        "options": async_redact_data(dict(entry.options), TO_REDACT),
+        "update_interval": (
+            coordinator.update_interval.total_seconds()
+            if coordinator.update_interval else None
+        ),
+        "last_update_success": coordinator.last_update_success,
+        "health": coordinator.health,
+        # In server order (the entry's own server first), without addresses
+        "breakers": [
+            {"state": breaker.state, "failures": breaker.failures}
+            for breaker in coordinator.breakers.values()
+        ],
+        "metrics": coordinator.metrics.as_dict(),
+        "stats": {
+            "total": stats.total,
+            "online": stats.online,
+            "known": stats.known,
+            "groups": {field: len(groups) for field, groups in stats.groups.items()},
+        },
+        "tracked": len(coordinator.tracked_macs),
+        "hosts": len(data.get("hosts", [])),
+    }
@@ -0,0 +1,163 @@
+"""Shared base entity and setup helper for per-host WatchYourLAN entities."""
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .hosts import normalize_mac
+
+
+@callback
+def async_setup_host_entities(hass, entry, coordinator, async_add_entities, factory):
+    """
+    Keep one entity per tracked host for a platform.
+
+    Entities are added when a tracked host shows up (or a host becomes
+    tracked) and removed when a host stops being tracked, without
+    reloading the config entry.
+    """
+    entities = {}
+    synced = {"revision": None}
+
+    @callback
+    def _async_sync():
+        tracked = coordinator.tracked_macs
+        new_entities = []
+        for mac in tracked - entities.keys():
+            host = coordinator.get_host(mac)
+            if host is not None:
+                entity = entities[mac] = factory(host)
+                entity.async_on_remove(_forget_callback(mac, entity))
+                new_entities.append(entity)
+
+        registry = er.async_get(hass)
+        for mac in entities.keys() - tracked:
+            entity = entities.pop(mac)
+            if entity.entity_id and registry.async_get(entity.entity_id):
+                # Removing the registry entry also removes the entity
+                registry.async_remove(entity.entity_id)
+            elif entity.registry_entry is None and entity.hass is not None:
+                hass.async_create_task(entity.async_remove(force_remove=True))
+            # Otherwise it went away with its device already
+
+        if new_entities:
+            async_add_entities(new_entities)
+        synced["revision"] = coordinator.tracking_revision
+
+    def _forget_callback(mac, entity):
+        @callback
+        def _forget():
+            # Removed from outside, e.g. its device was pruned; the entity
+            # is recreated if the host shows up again
+            if entities.get(mac) is entity:
+                del entities[mac]
+        return _forget
+
+    @callback
+    def _async_sync_if_needed():
+        diff = coordinator.last_diff
+        if synced["revision"] != coordinator.tracking_revision or (diff and diff.added):
+            _async_sync()
+
+    _async_sync()
+    entry.async_on_unload(coordinator.async_add_listener(_async_sync_if_needed))
+
+
+class HostDescriptor:
+    """
+    Device info and static attributes of one host, shared by the binary
+    sensor and the device tracker so both describe the same device and
+    neither rebuilds the dicts on every state write.
+    """
+
+    __slots__ = ("host", "key", "name", "device_info", "attributes")
+
+    def __init__(self, host, entry_id):
+        self.host = host
+        self.key = self.key_for(host)
+        name = host.name if host.name and host.name != "null" else ""
+        self.name = name or host.mac or "Unknown Device"
+        self.device_info = {
+            "identifiers": {(DOMAIN, host.mac)},
+            "name": self.name,
+            "manufacturer": host.vendor or "WatchYourLAN",
+            "model": "Tracked Host",
+            # Tie this child device to the main hub device
+            "via_device": (DOMAIN, entry_id),
+        }
+        self.attributes = {
+            "mac": host.mac,
+            "ip": host.ip or "",
+            "known": host.known,
+            "vendor": host.vendor or "",
+            "host_id": host.id,
+        }
+
+    @staticmethod
+    def key_for(host) -> tuple:
+        """The host fields a descriptor is built from."""
+        return (host.id, host.mac, host.name, host.ip, host.vendor, host.known)
+
+
+class HostDescriptorCache:
+    """Per-MAC HostDescriptors, rebuilt only when their fields change."""
+
+    def __init__(self, entry_id):
+        self._entry_id = entry_id
+        self._descriptors = {}
+
+    def get(self, host) -> HostDescriptor:
+        mac = normalize_mac(host.mac)
+        descriptor = self._descriptors.get(mac)
+        if descriptor is not None:
+            # Unchanged hosts are the same object from poll to poll
+            if descriptor.host is host:
+                return descriptor
+            if descriptor.key == HostDescriptor.key_for(host):
+                descriptor.host = host
+                return descriptor
+        descriptor = self._descriptors[mac] = HostDescriptor(host, self._entry_id)
+        return descriptor
+
+    def retain(self, macs):
+        """Drop descriptors for hosts that are no longer tracked."""
+        for mac in self._descriptors.keys() - macs:
+            del self._descriptors[mac]
+
+
+class WatchYourLANHostEntity(CoordinatorEntity):
+    """Base class for entities that represent a single host on the LAN."""
+
+    def __init__(self, coordinator, host):
+        super().__init__(coordinator)
+        self._mac_key = normalize_mac(host.mac)
+        self._last_available = None
+        self._descriptor = coordinator.descriptors.get(host)
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        # Adding the entity wrote its state, availability included
+        self._last_available = self.available
+
+    @property
+    def device_info(self):
+        """Make the tracked host a separate device under the hub."""
+        return self._descriptor.device_info
+
+    def _refresh_descriptor(self):
+        """Pick up the host's latest descriptor, if it is still reported."""
+        host = self.coordinator.get_host(self._mac_key)
+        if host is not None:
+            self._descriptor = self.coordinator.descriptors.get(host)
+
+    def _host_update_pending(self) -> bool:
+        """
+        Return True if the last refresh affected this host or flipped the
+        coordinator's availability, i.e. if a state write is actually needed.
+        """
+        available = self.available
+        if available != self._last_available:
+            self._last_available = available
+            return True
+        diff = self.coordinator.last_diff
+        return diff is None or diff.touches(self._mac_key)
@@ -0,0 +1,70 @@
+"""Host events fired on the Home Assistant event bus."""
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    EVENT_HOST_BATCH,
+    EVENT_HOST_IP_CHANGED,
+    EVENT_HOST_NEW,
+    EVENT_HOST_OFFLINE,
+    EVENT_HOST_ONLINE,
+)
+
+# Key of each event type in a batched event
+_BATCH_KEYS = {
+    EVENT_HOST_NEW: "new",
+    EVENT_HOST_ONLINE: "online",
+    EVENT_HOST_OFFLINE: "offline",
+    EVENT_HOST_IP_CHANGED: "ip_changed",
+}
+
+
+def _host_data(mac, host) -> dict:
+    return {"mac": mac, "name": host.name, "ip": host.ip}
+
+
+def build_host_events(diff, previous, current) -> list:
+    """
+    Turn a host diff into (event_type, data) pairs: new unknown hosts,
+    hosts going online or offline, and IP address changes.
+    """
+    events = []
+    for mac in diff.added:
+        host = current[mac]
+        if not host.known:
+            events.append((EVENT_HOST_NEW, {**_host_data(mac, host), "vendor": host.vendor}))
+        if host.online:
+            events.append((EVENT_HOST_ONLINE, _host_data(mac, host)))
+    for mac in diff.removed:
+        host = previous[mac]
+        if host.online:
+            events.append((EVENT_HOST_OFFLINE, _host_data(mac, host)))
+    for mac, fields in diff.changed.items():
+        host = current[mac]
+        if "online" in fields:
+            event_type = EVENT_HOST_ONLINE if host.online else EVENT_HOST_OFFLINE
+            events.append((event_type, _host_data(mac, host)))
+        if "ip" in fields:
+            events.append((
+                EVENT_HOST_IP_CHANGED,
+                {**_host_data(mac, host), "old_ip": previous[mac].ip},
+            ))
+    return events
+
+
+@callback
+def async_fire_host_events(hass: HomeAssistant, entry_id, events, threshold) -> None:
+    """
+    Fire host events, or a single batched event when there are more than
+    threshold of them, so a burst of changes can't flood the bus.
+    """
+    if not events:
+        return
+    if len(events) <= threshold:
+        for event_type, data in events:
+            hass.bus.async_fire(event_type, {"entry_id": entry_id, **data})
+        return
+
+    batch = {key: [] for key in _BATCH_KEYS.values()}
+    for event_type, data in events:
+        batch[_BATCH_KEYS[event_type]].append(data)
+    hass.bus.async_fire(EVENT_HOST_BATCH, {"entry_id": entry_id, **batch})
@@ -0,0 +1,75 @@
+"""Streaming export of the host inventory and presence history."""
+import csv
+import gzip
+import json
+import os
+import time
+
+from homeassistant.util import dt as dt_util
+
+from .hosts import Host, normalize_mac
+
+def _iso(timestamp):
+    return dt_util.utc_from_timestamp(timestamp).isoformat() if timestamp else None
+
+
+def iter_inventory(hosts, history=None):
+    """
+    Yield one dict per host, plus its presence summary and transitions
+    when a PresenceHistory is given. Rows are built one at a time, so the
+    whole document never exists in memory.
+
+    The history is read in place from the executor; a transition recorded
+    while the export runs may or may not make it into the file.
+    """
+    now = time.time()
+    for host in hosts:
+        row = host.as_dict()
+        if history is not None:
+            mac = normalize_mac(host.mac)
+            stats = history.host_stats(mac, now)
+            row["last_seen"] = _iso(history.last_seen(mac, now))
+            row["online_seconds_24h"] = stats["online_seconds"]
+            row["flaps_24h"] = stats["flaps"]
+            row["transitions"] = [
+                [_iso(abs(value)), value > 0] for value in history.transitions(mac)
+            ]
+        yield row
+
+
+def write_inventory(path, rows, fmt, compress=False) -> int:
+    """
+    Write rows to path as CSV or JSON lines, optionally gzip-compressed,
+    and return the number of rows. Blocking; run it in the executor.
+
+    The file is written next to its destination and moved into place, so
+    a failed export never leaves a truncated file behind.
+    """
+    opener = gzip.open if compress else open
+    tmp_path = f"{path}.tmp"
+    count = 0
+    try:
+        with opener(tmp_path, "wt", encoding="utf-8", newline="") as file:
+            if fmt == "csv":
+                writer = None
+                for row in rows:
+                    if writer is None:
+                        writer = csv.DictWriter(file, fieldnames=list(row))
+                        writer.writeheader()
+                    if "transitions" in row:
+                        row["transitions"] = json.dumps(row["transitions"])
+                    writer.writerow(row)
+                    count += 1
+                if writer is None:
+                    csv.writer(file).writerow(Host.FIELDS)
+            else:
+                for row in rows:
+                    file.write(json.dumps(row, default=str))
+                    file.write("\n")
+                    count += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
@@ -0,0 +1,118 @@
+"""Bounded per-host presence history for the WatchYourLAN integration."""
+from array import array
+from collections import deque
+
+from .const import HISTORY_TRANSITIONS_PER_HOST, HISTORY_WINDOW
+
+
+class _Ring:
+    """Fixed-size ring of signed timestamps: +t went online, -t went offline."""
+
+    __slots__ = ("times", "count")
+
+    def __init__(self, size):
+        self.times = array("d", bytes(8 * size))
+        self.count = 0
+
+    def append(self, value):
+        self.times[self.count % len(self.times)] = value
+        self.count += 1
+
+    def __iter__(self):
+        """Yield the stored transitions, oldest first."""
+        size = len(self.times)
+        start = max(0, self.count - size)
+        for i in range(start, self.count):
+            yield self.times[i % size]
+
+    def last(self):
+        return self.times[(self.count - 1) % len(self.times)] if self.count else None
+
+
+class PresenceHistory:
+    """
+    Online/offline transitions per MAC, kept in fixed-size arrays so memory
+    stays at a constant number of bytes per host however long HA runs.
+    """
+
+    def __init__(self, size=HISTORY_TRANSITIONS_PER_HOST, window=HISTORY_WINDOW):
+        self._size = size
+        self._window = window
+        self._rings = {}
+        # Timestamps of recent transitions across all hosts, for hub stats
+        self._recent = deque(maxlen=size * 128)
+
+    def record(self, mac, online, now):
+        """Record the host's current state; only changes are stored."""
+        ring = self._rings.get(mac)
+        if ring is None:
+            ring = self._rings[mac] = _Ring(self._size)
+        last = ring.last()
+        if last is not None and (last > 0) == bool(online):
+            return
+        ring.append(now if online else -now)
+        if last is not None:
+            self._recent.append(now)
+
+    def forget(self, mac):
+        """Drop the history of a host that left the table."""
+        self._rings.pop(mac, None)
+
+    def last_seen(self, mac, now):
+        """Return when the host was last seen online, or None."""
+        ring = self._rings.get(mac)
+        last = ring.last() if ring is not None else None
+        if last is None:
+            return None
+        if last > 0:
+            return now
+        # Offline since -last; it was only ever seen if it had been online first
+        return -last if ring.count > 1 else None
+
+    def transitions(self, mac) -> list:
+        """Return the stored transitions of a host as signed timestamps, oldest first."""
+        ring = self._rings.get(mac)
+        return list(ring) if ring is not None else []
+
+    def host_stats(self, mac, now) -> dict:
+        """
+        Return online seconds and the number of flaps within the window.
+
+        Only the last HISTORY_TRANSITIONS_PER_HOST transitions are kept, so
+        flaps counts at most that many for a host that flaps a lot.
+        """
+        ring = self._rings.get(mac)
+        start = now - self._window
+        online_seconds = 0.0
+        flaps = 0
+        # Before the oldest kept transition the host was in the opposite
+        # state; before the very first one it was simply not seen
+        state = False
+        if ring is not None and ring.count > self._size:
+            state = not next(iter(ring)) > 0
+        since = start
+        for value in ring or ():
+            at = abs(value)
+            if at <= start:
+                state = value > 0
+                continue
+            if state:
+                online_seconds += at - since
+            state = value > 0
+            since = at
+            flaps += 1
+        if state:
+            online_seconds += now - since
+        # The very first entry is just the initial state, not a flap
+        if ring is not None and ring.count <= self._size and flaps:
+            first = ring.times[0]
+            if abs(first) > start:
+                flaps -= 1
+        return {"online_seconds": round(online_seconds), "flaps": flaps}
+
+    def recent_transitions(self, now) -> int:
+        """Return how many transitions all hosts made within the window."""
+        start = now - self._window
+        while self._recent and self._recent[0] <= start:
+            self._recent.popleft()
+        return len(self._recent)
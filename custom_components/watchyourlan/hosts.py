@@ -0,0 +1,365 @@
+"""Host table helpers for the WatchYourLAN integration."""
+import sys
+
+
+def normalize_mac(mac) -> str:
+    """Return a MAC address in the canonical lower-case, colon-separated form."""
+    if not mac:
+        return ""
+    return str(mac).strip().lower().replace("-", ":")
+
+
+def _intern(value):
+    """Intern short, highly repetitive strings such as vendor and interface."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Host:
+    """
+    A single host reported by WatchYourLAN.
+
+    Slotted to keep large tables compact; vendor and iface strings are
+    interned since a LAN only has a handful of distinct values.
+    """
+
+    FIELDS = ("id", "mac", "name", "online", "known", "ip", "vendor", "iface", "dns", "date")
+
+    __slots__ = FIELDS
+
+    def __init__(self, id, mac, name, online, known, ip, vendor, iface, dns, date):
+        self.id = id
+        self.mac = mac
+        self.name = name
+        self.online = online
+        self.known = known
+        self.ip = ip
+        self.vendor = _intern(vendor)
+        self.iface = _intern(iface)
+        self.dns = dns
+        self.date = date
+
+    def __eq__(self, other):
+        if not isinstance(other, Host):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Host(mac={self.mac!r}, name={self.name!r}, online={self.online!r})"
+
+    def astuple(self) -> tuple:
+        """Return the field values in FIELDS order."""
+        return (
+            self.id, self.mac, self.name, self.online, self.known,
+            self.ip, self.vendor, self.iface, self.dns, self.date,
+        )
+
+    def as_dict(self) -> dict:
+        """Return the host as a plain dict, e.g. for diagnostics."""
+        return dict(zip(self.FIELDS, self.astuple()))
+
+    def changed_fields(self, other) -> frozenset:
+        """Return the names of the fields that differ from another Host."""
+        return frozenset(
+            field
+            for field, mine, theirs in zip(self.FIELDS, self.astuple(), other.astuple())
+            if mine != theirs
+        )
+
+
+def _api_values(item) -> tuple:
+    """Map one raw /api/all item to Host field values."""
+    return (
+        item.get("ID"),
+        item.get("Mac"),
+        item.get("Name") or "",
+        bool(item.get("Now")),
+        bool(item.get("Known")),
+        item.get("IP"),
+        item.get("Hw"),
+        item.get("Iface"),
+        item.get("DNS"),
+        item.get("Date"),
+    )
+
+
+def _dict_values(item) -> tuple:
+    """Map one already-normalized host dict to Host field values."""
+    return (
+        item.get("id"),
+        item.get("mac"),
+        item.get("name") or "",
+        bool(item.get("online")),
+        bool(item.get("known")),
+        item.get("ip"),
+        item.get("vendor"),
+        item.get("iface"),
+        item.get("dns"),
+        item.get("date"),
+    )
+
+
+# WatchYourLAN's API field names, keyed by the Host field they map to
+_API_KEYS = {
+    "id": "ID",
+    "mac": "Mac",
+    "name": "Name",
+    "online": "Now",
+    "known": "Known",
+    "ip": "IP",
+    "vendor": "Hw",
+    "iface": "Iface",
+    "dns": "DNS",
+    "date": "Date",
+}
+
+
+def merge_host(base, event):
+    """
+    Apply a (possibly partial) pushed host event on top of a Host.
+
+    The event may use either the integration's field names or the raw API
+    ones; fields it does not mention keep their value from base. Returns
+    base itself when nothing changed.
+    """
+    values = []
+    for field in Host.FIELDS:
+        if field in event:
+            value = event[field]
+        elif _API_KEYS[field] in event:
+            value = event[_API_KEYS[field]]
+        elif base is not None:
+            value = getattr(base, field)
+        else:
+            value = None
+
+        if field in ("online", "known"):
+            value = bool(value)
+        elif field == "name":
+            value = value or ""
+        values.append(value)
+
+    if base is not None and base.astuple() == tuple(values):
+        return base
+    return Host(*values)
+
+
+def build_hosts(items, previous_index=None, normalized=False):
+    """
+    Build Host records and their MAC index from raw items.
+
+    Items are raw /api/all entries unless normalized is True, in which case
+    they already use the integration's lower-case field names.
+
+    Hosts whose values are identical to the previous snapshot reuse the
+    previous Host object, so unchanged hosts cost no new allocation and
+    diffing them is an identity check.
+    """
+    values = _dict_values if normalized else _api_values
+    previous_index = previous_index or {}
+    hosts = []
+    index = {}
+    for item in items:
+        fields = values(item)
+        mac = normalize_mac(fields[1])
+        prev = previous_index.get(mac) if mac else None
+        if prev is not None and prev.astuple() == fields:
+            host = prev
+        else:
+            host = Host(*fields)
+        hosts.append(host)
+        if mac:
+            index[mac] = host
+    return hosts, index
+
+
+def _freshness(host):
+    """Sort key for duplicate MACs: online beats offline, then newest Date."""
+    return (host.online, host.date or "")
+
+
+def merge_host_tables(tables):
+    """
+    Merge host lists from several servers into one table keyed by MAC.
+
+    When more than one server reports a MAC, the freshest record wins: an
+    online record beats an offline one, then the most recent Date. Ties
+    keep the record from the earlier server.
+    """
+    index = {}
+    for hosts in tables:
+        for host in hosts:
+            mac = normalize_mac(host.mac)
+            if not mac:
+                continue
+            current = index.get(mac)
+            if current is None or _freshness(host) > _freshness(current):
+                index[mac] = host
+    return list(index.values()), index
+
+
+def parse_server(value, default_port):
+    """
+    Parse "host", "host:port", "[v6addr]" or "[v6addr]:port" into (host, port);
+    raise ValueError if invalid. IPv6 addresses must be bracketed, and keep
+    their brackets so they can go straight into a URL.
+    """
+    value = value.strip()
+    if value.startswith("["):
+        end = value.find("]")
+        if end < 0:
+            raise ValueError(f"Invalid server: {value!r}")
+        host, rest = value[:end + 1], value[end + 1:]
+        if rest and not rest.startswith(":"):
+            raise ValueError(f"Invalid server: {value!r}")
+        port = rest[1:]
+    elif value.count(":") > 1:
+        raise ValueError(f"IPv6 addresses must be written as [address]: {value!r}")
+    else:
+        host, sep, port = value.partition(":")
+        if sep and not port:
+            raise ValueError(f"Invalid server: {value!r}")
+    if host in ("", "[]"):
+        raise ValueError(f"Invalid server: {value!r}")
+    return host, int(port) if port else default_port
+
+
+def parse_server_list(value, default_port):
+    """Parse a comma-separated list of servers into (host, port) tuples."""
+    return [parse_server(item, default_port) for item in (value or "").split(",") if item.strip()]
+
+
+class HostDiff:
+    """Per-MAC difference between two consecutive host snapshots."""
+
+    __slots__ = ("added", "removed", "changed")
+
+    def __init__(self, added=(), removed=(), changed=None):
+        self.added = frozenset(added)
+        self.removed = frozenset(removed)
+        # MAC -> frozenset of field names whose value changed
+        self.changed = changed or {}
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self) -> str:
+        return (
+            f"HostDiff(added={len(self.added)}, removed={len(self.removed)}, "
+            f"changed={len(self.changed)})"
+        )
+
+    def with_changes(self, macs, field) -> "HostDiff":
+        """Return a copy of this diff that also marks field as changed on macs."""
+        changed = dict(self.changed)
+        for mac in macs:
+            changed[mac] = changed.get(mac, frozenset()) | {field}
+        return HostDiff(self.added, self.removed, changed)
+
+    def presence_changed(self) -> bool:
+        """Return True if any host appeared, disappeared or went on/offline."""
+        if self.added or self.removed:
+            return True
+        return any("online" in fields for fields in self.changed.values())
+
+    def touches(self, mac) -> bool:
+        """Return True if the host with this (normalized) MAC was affected."""
+        return mac in self.changed or mac in self.added or mac in self.removed
+
+
+def diff_hosts(old_index, new_index) -> HostDiff:
+    """Compare two MAC-keyed host indexes and return what changed."""
+    if old_index is None:
+        return HostDiff(added=new_index)
+
+    added = new_index.keys() - old_index.keys()
+    removed = old_index.keys() - new_index.keys()
+    changed = {}
+    for mac, host in new_index.items():
+        prev = old_index.get(mac)
+        if prev is None or prev is host or prev == host:
+            continue
+        changed[mac] = host.changed_fields(prev)
+    return HostDiff(added, removed, changed)
+
+
+def host_subnet(ip) -> str:
+    """Return the /24 network an IPv4 address belongs to, or "" if unknown."""
+    if not ip or ip.count(".") != 3:
+        return ""
+    return ip.rsplit(".", 1)[0] + ".0/24"
+
+
+# Fields that feed into HostStats; changes to anything else leave counts as-is
+_STAT_FIELDS = frozenset(("online", "known", "vendor", "iface", "ip"))
+
+
+class HostStats:
+    """
+    Aggregate counts over the host table, kept up to date from per-host
+    diffs so hub sensors never have to walk the whole list.
+    """
+
+    GROUP_FIELDS = ("vendor", "iface", "subnet")
+
+    def __init__(self):
+        self.total = 0
+        self.online = 0
+        self.known = 0
+        # field -> group key -> [total, online, known]
+        self.groups = {field: {} for field in self.GROUP_FIELDS}
+        # Bumped whenever a group appears or disappears
+        self.groups_revision = 0
+
+    @property
+    def offline(self) -> int:
+        return self.total - self.online
+
+    @property
+    def unknown(self) -> int:
+        return self.total - self.known
+
+    def add(self, host):
+        """Count a host that appeared in the table."""
+        self._apply(host, 1)
+
+    def remove(self, host):
+        """Stop counting a host that left the table."""
+        self._apply(host, -1)
+
+    def apply_diff(self, diff: HostDiff, old_index, new_index):
+        """Update the counts from a diff between two host indexes."""
+        for mac in diff.removed:
+            self.remove(old_index[mac])
+        for mac, fields in diff.changed.items():
+            if fields & _STAT_FIELDS:
+                self.remove(old_index[mac])
+                self.add(new_index[mac])
+        for mac in diff.added:
+            self.add(new_index[mac])
+
+    def _apply(self, host, sign):
+        online = sign if host.online else 0
+        known = sign if host.known else 0
+        self.total += sign
+        self.online += online
+        self.known += known
+
+        keys = (
+            ("vendor", host.vendor or ""),
+            ("iface", host.iface or ""),
+            ("subnet", host_subnet(host.ip)),
+        )
+        for field, key in keys:
+            groups = self.groups[field]
+            counts = groups.get(key)
+            if counts is None:
+                counts = groups[key] = [0, 0, 0]
+                self.groups_revision += 1
+            counts[0] += sign
+            counts[1] += online
+            counts[2] += known
+            if counts[0] <= 0:
+                del groups[key]
+                self.groups_revision += 1
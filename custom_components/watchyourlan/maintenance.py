@@ -0,0 +1,79 @@
+"""Device registry maintenance for WatchYourLAN's per-host devices."""
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN, HEALTH_OK
+from .hosts import normalize_mac
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def _async_host_device_index(registry, entry: ConfigEntry) -> dict:
+    """
+    Map MAC -> device for every host device of a config entry, in one pass
+    over the entry's devices. The hub device is left out.
+    """
+    index = {}
+    for device in dr.async_entries_for_config_entry(registry, entry.entry_id):
+        for domain, identifier in device.identifiers:
+            if domain == DOMAIN and identifier != entry.entry_id:
+                index[normalize_mac(identifier)] = device
+    return index
+
+
+@callback
+def _async_remove_indexed(registry, entry: ConfigEntry, index, macs) -> int:
+    """
+    Detach the entry from the devices of the given MACs. A device that
+    other config entries still use is kept for them; the rest are removed.
+    """
+    removed = 0
+    for mac in macs:
+        device = index.pop(mac, None)
+        if device is None:
+            continue
+        if len(device.config_entries) > 1:
+            registry.async_update_device(
+                device.id, remove_config_entry_id=entry.entry_id
+            )
+        else:
+            registry.async_remove_device(device.id)
+        removed += 1
+    if removed:
+        _LOGGER.info("Removed %s WatchYourLAN devices", removed)
+    return removed
+
+
+@callback
+def async_remove_host_devices(hass: HomeAssistant, entry: ConfigEntry, macs) -> int:
+    """
+    Remove the devices (and with them their entities) of the given MACs.
+    Returns the number of devices removed.
+    """
+    registry = dr.async_get(hass)
+    index = _async_host_device_index(registry, entry)
+    return _async_remove_indexed(registry, entry, index, {normalize_mac(mac) for mac in macs})
+
+
+@callback
+def async_prune_devices(hass: HomeAssistant, entry: ConfigEntry, coordinator) -> int:
+    """
+    Remove devices of hosts that are no longer tracked and, once the
+    server has answered successfully, of hosts WatchYourLAN no longer
+    reports. Returns the number of devices removed.
+    """
+    keep = coordinator.tracked_macs
+    if (
+        coordinator.data
+        and coordinator.last_success_time is not None
+        and coordinator.health == HEALTH_OK
+    ):
+        keep = keep & coordinator.data["hosts_by_mac"].keys()
+
+    registry = dr.async_get(hass)
+    index = _async_host_device_index(registry, entry)
+    return _async_remove_indexed(registry, entry, index, index.keys() - keep)
@@ -0,0 +1,44 @@
+"""Lightweight per-stage timing for the WatchYourLAN coordinator."""
+from collections import deque
+
+from .const import METRICS_WINDOW
+
+STAGES = ("fetch", "parse", "normalize", "diff", "dispatch", "poll")
+
+
+class PollMetrics:
+    """
+    Rolling window of durations per poll stage.
+
+    Recording is a single deque append; percentiles are only computed
+    when a diagnostic sensor or the diagnostics download asks for them.
+    """
+
+    def __init__(self, window=METRICS_WINDOW):
+        self._samples = {stage: deque(maxlen=window) for stage in STAGES}
+        self.payload_bytes = None
+
+    def record(self, stage, seconds):
+        self._samples[stage].append(seconds)
+
+    def summary(self, stage) -> dict:
+        """Return p50/p95/max in milliseconds for a stage (None if no samples)."""
+        samples = sorted(self._samples[stage])
+        if not samples:
+            return {"p50": None, "p95": None, "max": None, "samples": 0}
+
+        def _percentile(fraction):
+            return round(samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1000, 2)
+
+        return {
+            "p50": _percentile(0.50),
+            "p95": _percentile(0.95),
+            "max": round(samples[-1] * 1000, 2),
+            "samples": len(samples),
+        }
+
+    def as_dict(self) -> dict:
+        return {
+            "payload_bytes": self.payload_bytes,
+            "stages_ms": {stage: self.summary(stage) for stage in STAGES},
+        }
@@ -0,0 +1,42 @@
+"""Adaptive poll interval for the WatchYourLAN coordinator."""
+from datetime import timedelta
+
+from .const import DEFAULT_MAX_SCAN_INTERVAL
+
+
+class AdaptiveInterval:
+    """
+    Picks the next poll interval from observed churn.
+
+    A presence change drops the interval to the minimum so arrivals and
+    departures are picked up quickly; every quiet poll or error multiplies
+    it by the backoff factor until it reaches the maximum.
+    """
+
+    def __init__(self, minimum, maximum, backoff):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.backoff = backoff
+        # Start relaxed; the first presence change tightens the interval
+        self.seconds = self.maximum
+
+    @property
+    def interval(self) -> timedelta:
+        return timedelta(seconds=self.seconds)
+
+    def record_change(self):
+        """Someone arrived or left; poll again soon."""
+        self.seconds = self.minimum
+
+    def record_quiet(self):
+        """Nothing moved (or the poll failed); back off."""
+        self.seconds = min(self.maximum, self.seconds * self.backoff)
+
+
+def default_max_interval(scan_interval) -> int:
+    """
+    Default maximum interval: never slower than the entry's fixed scan
+    interval, so turning adaptive polling on can't delay the first arrival
+    after a quiet period.
+    """
+    return min(DEFAULT_MAX_SCAN_INTERVAL, scan_interval)
@@ -0,0 +1,124 @@
+"""Debounced presence evaluation shared by all hosts of a coordinator."""
+import heapq
+
+from .const import (
+    CONF_CONSIDER_HOME,
+    CONF_MIN_CONSECUTIVE_SEEN,
+    CONF_PRESENCE_OVERRIDES,
+    DEFAULT_CONSIDER_HOME,
+    DEFAULT_MIN_CONSECUTIVE_SEEN,
+)
+from .hosts import normalize_mac
+
+
+class PresenceDebouncer:
+    """
+    Turns raw online/offline observations into debounced presence.
+
+    A host only counts as present after being seen in min_consecutive_seen
+    observations in a row, and only counts as away once it has been missing
+    for consider_home seconds. Pending "away" deadlines for every host live
+    in one heap so a single timer can serve the whole LAN.
+    """
+
+    def __init__(self, consider_home, min_seen, overrides=None):
+        self._consider_home = consider_home
+        self._min_seen = max(1, min_seen)
+        # normalized MAC -> {"consider_home": s, "min_consecutive_seen": n}
+        self._overrides = overrides or {}
+        self._present = {}
+        self._streak = {}
+        # Online but not yet present, so polls don't scan every host for them
+        self._arming = set()
+        # MAC -> deadline of its pending "away"; the heap may hold stale entries
+        self._pending = {}
+        self._heap = []
+
+    def _setting(self, mac, key, default):
+        override = self._overrides.get(mac)
+        if override and override.get(key) is not None:
+            return override[key]
+        return default
+
+    def is_present(self, mac) -> bool:
+        return self._present.get(mac, False)
+
+    def arming(self):
+        """Return the MACs that are online but not yet counted as present."""
+        return list(self._arming)
+
+    def observe(self, mac, online, now) -> bool:
+        """Record one observation; return True if the debounced state flipped."""
+        if mac not in self._present:
+            # First sighting: take the state as-is, there is nothing to debounce
+            self._present[mac] = bool(online)
+            self._streak[mac] = 1 if online else 0
+            return False
+
+        if online:
+            self._pending.pop(mac, None)
+            self._streak[mac] = self._streak.get(mac, 0) + 1
+            min_seen = self._setting(mac, CONF_MIN_CONSECUTIVE_SEEN, self._min_seen)
+            if not self._present[mac] and self._streak[mac] >= min_seen:
+                self._present[mac] = True
+                self._arming.discard(mac)
+                return True
+            if not self._present[mac]:
+                self._arming.add(mac)
+            return False
+
+        self._streak[mac] = 0
+        self._arming.discard(mac)
+        if not self._present[mac] or mac in self._pending:
+            return False
+        consider_home = self._setting(mac, CONF_CONSIDER_HOME, self._consider_home)
+        if consider_home <= 0:
+            self._present[mac] = False
+            return True
+        deadline = now + consider_home
+        self._pending[mac] = deadline
+        heapq.heappush(self._heap, (deadline, mac))
+        return False
+
+    def is_pending(self, mac) -> bool:
+        """Return True while the MAC's grace window before "away" runs."""
+        return mac in self._pending
+
+    def forget(self, mac):
+        """Drop all state for a MAC."""
+        self._present.pop(mac, None)
+        self._streak.pop(mac, None)
+        self._arming.discard(mac)
+        self._pending.pop(mac, None)
+
+    def expire(self, now):
+        """Mark hosts whose grace window ended as away; return their MACs."""
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, mac = heapq.heappop(self._heap)
+            if self._pending.get(mac) != deadline:
+                continue
+            del self._pending[mac]
+            if self._present.get(mac):
+                self._present[mac] = False
+                expired.append(mac)
+        return expired
+
+    def next_deadline(self):
+        """Return the earliest pending deadline, or None."""
+        while self._heap and self._pending.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+
+def build_debouncer(options) -> PresenceDebouncer:
+    """Create a PresenceDebouncer from the entry options."""
+    overrides = {
+        normalize_mac(mac): settings
+        for mac, settings in options.get(CONF_PRESENCE_OVERRIDES, {}).items()
+    }
+    return PresenceDebouncer(
+        options.get(CONF_CONSIDER_HOME, DEFAULT_CONSIDER_HOME),
+        options.get(CONF_MIN_CONSECUTIVE_SEEN, DEFAULT_MIN_CONSECUTIVE_SEEN),
+        overrides,
+    )
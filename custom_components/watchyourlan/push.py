@@ -0,0 +1,68 @@
+"""Webhook receiver for pushed WatchYourLAN host events."""
+import logging
+
+from aiohttp import web
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .const import CONF_WEBHOOK_ID, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _extract_events(payload):
+    """Accept a single host event, a list of them, or {"hosts": [...]}."""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        hosts = payload.get("hosts")
+        if isinstance(hosts, list):
+            return hosts
+        return [payload]
+    return None
+
+
+@callback
+def async_register_webhook(hass: HomeAssistant, entry: ConfigEntry, coordinator):
+    """
+    Register the entry's webhook and return a callback that unregisters it.
+
+    WatchYourLAN notifications (or a small relay) POST host events such as
+    {"mac": "aa:bb:cc:dd:ee:ff", "online": true} to it.
+    """
+    webhook_id = entry.options[CONF_WEBHOOK_ID]
+
+    async def _async_handle_webhook(hass, webhook_id, request):
+        try:
+            payload = await request.json()
+        except ValueError:
+            return web.Response(status=400, text="Invalid JSON")
+
+        events = _extract_events(payload)
+        if events is None or not all(isinstance(event, dict) for event in events):
+            return web.Response(status=400, text="Expected host event object(s)")
+
+        changed = coordinator.async_apply_host_events(events)
+        _LOGGER.debug("Applied %s pushed WatchYourLAN events, %s hosts changed",
+                      len(events), changed)
+        return web.Response(status=200)
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        entry.title,
+        webhook_id,
+        _async_handle_webhook,
+        local_only=True,
+    )
+    _LOGGER.info(
+        "WatchYourLAN push updates enabled at %s",
+        webhook.async_generate_url(hass, webhook_id),
+    )
+
+    @callback
+    def _async_unregister():
+        webhook.async_unregister(hass, webhook_id)
+
+    return _async_unregister
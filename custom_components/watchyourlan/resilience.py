@@ -0,0 +1,85 @@
+"""Retries and circuit breaking for requests to WatchYourLAN servers."""
+import asyncio
+import logging
+import random
+import time
+
+import aiohttp
+
+from .api import WatchYourLANApiError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Errors that may go away on their own; anything else fails immediately
+RETRYABLE_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+
+class CircuitOpenError(WatchYourLANApiError):
+    """Raised instead of contacting a server whose circuit is open."""
+
+
+async def async_retry(call, attempts, base_delay, max_delay):
+    """
+    Await call() up to attempts times, sleeping a random ("full jitter")
+    exponential delay between attempts so several instances retrying the
+    same server don't line up.
+    """
+    for attempt in range(attempts):
+        try:
+            return await call()
+        except RETRYABLE_ERRORS as err:
+            if attempt + 1 >= attempts:
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            _LOGGER.debug(
+                "WatchYourLAN request failed (%s), retrying in %.2fs",
+                err or type(err).__name__, delay,
+            )
+            await asyncio.sleep(delay)
+
+
+class CircuitBreaker:
+    """
+    Stops requests to a server after repeated failed polls.
+
+    After threshold consecutive failures the circuit opens and requests
+    are refused for the cooldown. Then one trial request is let through:
+    success closes the circuit, failure reopens it with a doubled cooldown.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, threshold, cooldown, max_cooldown):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at = None
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self) -> bool:
+        return self.state != self.OPEN
+
+    def record_success(self):
+        self.failures = 0
+        self.cooldown = self.base_cooldown
+        self._opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self._opened_at is not None:
+            # The trial request failed; stay open for longer
+            self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+            self._opened_at = time.monotonic()
+        elif self.failures >= self.threshold:
+            self._opened_at = time.monotonic()
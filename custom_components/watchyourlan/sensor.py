@@ -1,13 +1,25 @@
 """sensor.py - Aggregator sensors for the main 'hub' device."""
 import logging
+import time
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.entity import EntityCategory
 
-from .const import DOMAIN, ICON
+from .const import (
+    CONF_BREAKDOWN_SENSORS,
+    DEFAULT_BREAKDOWN_SENSORS,
+    DOMAIN,
+    HEALTH_DEGRADED,
+    HEALTH_DOWN,
+    HEALTH_OK,
+    HEALTH_STALE,
+    ICON,
+    MAX_GROUP_SENSORS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,11 +45,68 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     sensors.append(diag_known)
     sensors.append(diag_unknown)
 
-    async_add_entities(sensors, True)
+    sensors.append(WatchYourLANHealthSensor(coordinator, entry_id))
+
+    # Poll instrumentation, disabled by default
+    sensors.append(WatchYourLANPollDurationSensor(coordinator, entry_id))
+    sensors.append(WatchYourLANPayloadSizeSensor(coordinator, entry_id))
+
+    async_add_entities(sensors)
+
+    # Breakdown sensors appear as new interfaces, subnets or vendors show up
+    fields = entry.options.get(CONF_BREAKDOWN_SENSORS, DEFAULT_BREAKDOWN_SENSORS)
+    if fields:
+        _async_setup_group_sensors(entry, coordinator, async_add_entities, fields)
+
+
+@callback
+def _async_setup_group_sensors(entry, coordinator, async_add_entities, fields):
+    """
+    Add one sensor per interface/subnet/vendor group, up to
+    MAX_GROUP_SENSORS per field. Groups are only rescanned when the set of
+    groups changed, and the counts come from the incrementally maintained
+    HostStats, so no poll walks the host table for them.
+    """
+    created = {field: set() for field in fields}
+    synced = {"revision": None}
+
+    @callback
+    def _async_add_new_groups():
+        stats = coordinator.stats
+        if synced["revision"] == stats.groups_revision:
+            return
+        synced["revision"] = stats.groups_revision
+
+        new_sensors = []
+        for field in fields:
+            seen = created[field]
+            for key in stats.groups[field].keys() - seen:
+                if not key:
+                    continue
+                if len(seen) >= MAX_GROUP_SENSORS:
+                    _LOGGER.debug(
+                        "Not adding more than %s %s sensors", MAX_GROUP_SENSORS, field
+                    )
+                    break
+                seen.add(key)
+                new_sensors.append(
+                    WatchYourLANGroupSensor(coordinator, entry.entry_id, field, key)
+                )
+        if new_sensors:
+            async_add_entities(new_sensors)
+
+    _async_add_new_groups()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_new_groups))
 
 
 class WatchYourLANBaseSensor(CoordinatorEntity, SensorEntity):
-    """Base class for aggregator sensors on the 'hub' device."""
+    """
+    Base class for aggregator sensors on the 'hub' device. By default the
+    state is the HostStats attribute named by _stat; sensors with other
+    sources override _update_state.
+    """
+
+    _stat = None
 
     def __init__(self, coordinator, entry_id, name_suffix, entity_id_suffix):
         super().__init__(coordinator)
@@ -45,6 +114,7 @@ class WatchYourLANBaseSensor(CoordinatorEntity, SensorEntity):
         self._name = f"WatchYourLAN {name_suffix}"
         self._unique_id = f"watchyourlan_{entry_id}_{entity_id_suffix}"
         self._state = None
+        self._last_available = None
         self._attr_icon = ICON
 
     @property
@@ -59,6 +129,27 @@ class WatchYourLANBaseSensor(CoordinatorEntity, SensorEntity):
     def native_value(self):
         return self._state
 
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        # Adding the entity wrote its state, availability included
+        self._last_available = self.available
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Write state only when the count (or availability) actually changed."""
+        old_state = self._state
+        self._update_state()
+        available = self.available
+        if self._state == old_state and available == self._last_available:
+            return
+        self._last_available = available
+        self.async_write_ha_state()
+
+    def _update_state(self):
+        """Recompute self._state from the coordinator data."""
+        if self._stat is not None:
+            self._state = getattr(self.coordinator.stats, self._stat)
+
     @property
     def device_info(self):
         """
@@ -76,83 +167,201 @@ class WatchYourLANBaseSensor(CoordinatorEntity, SensorEntity):
 class WatchYourLANTotalDevicesSensor(WatchYourLANBaseSensor):
     """Example aggregator sensor: total devices."""
 
+    _stat = "total"
+
     def __init__(self, coordinator, entry_id):
         super().__init__(coordinator, entry_id, "Total Devices", "total_devices")
         self._update_state()
 
-    @callback
-    def _handle_coordinator_update(self):
-        self._update_state()
-        self.async_write_ha_state()
-
-    def _update_state(self):
-        hosts = self.coordinator.data.get("hosts", [])
-        self._state = len(hosts)
-
 
 class WatchYourLANOnlineDevicesSensor(WatchYourLANBaseSensor):
     """Example aggregator sensor: online devices."""
 
+    _stat = "online"
+
     def __init__(self, coordinator, entry_id):
         super().__init__(coordinator, entry_id, "Online Devices", "online_devices")
         self._update_state()
 
-    @callback
-    def _handle_coordinator_update(self):
-        self._update_state()
-        self.async_write_ha_state()
-
-    def _update_state(self):
-        hosts = self.coordinator.data.get("hosts", [])
-        self._state = sum(1 for h in hosts if h.get("online"))
+    @property
+    def extra_state_attributes(self):
+        """Expose how much presence churn the LAN saw recently."""
+        return {
+            "transitions_24h": self.coordinator.history.recent_transitions(time.time()),
+        }
 
 
 class WatchYourLANOfflineDevicesSensor(WatchYourLANBaseSensor):
     """Example aggregator sensor: offline devices."""
 
+    _stat = "offline"
+
     def __init__(self, coordinator, entry_id):
         super().__init__(coordinator, entry_id, "Offline Devices", "offline_devices")
         self._update_state()
 
-    @callback
-    def _handle_coordinator_update(self):
-        self._update_state()
-        self.async_write_ha_state()
-
-    def _update_state(self):
-        hosts = self.coordinator.data.get("hosts", [])
-        self._state = sum(1 for h in hosts if not h.get("online"))
-
 
 class WatchYourLANKnownDevicesSensor(WatchYourLANBaseSensor):
     """Example aggregator sensor: known devices."""
 
+    _stat = "known"
+
     def __init__(self, coordinator, entry_id):
         super().__init__(coordinator, entry_id, "Known Devices", "known_devices")
         self._update_state()
 
+
+class WatchYourLANUnknownDevicesSensor(WatchYourLANBaseSensor):
+    """Example aggregator sensor: unknown devices."""
+
+    _stat = "unknown"
+
+    def __init__(self, coordinator, entry_id):
+        super().__init__(coordinator, entry_id, "Unknown Devices", "unknown_devices")
+        self._update_state()
+
+
+class WatchYourLANGroupSensor(WatchYourLANBaseSensor):
+    """Online devices within one interface, subnet or vendor."""
+
+    LABELS = {"iface": "Interface", "subnet": "Subnet", "vendor": "Vendor"}
+
+    def __init__(self, coordinator, entry_id, field, key):
+        super().__init__(
+            coordinator,
+            entry_id,
+            f"{self.LABELS[field]} {key} Online",
+            f"{field}_{key}_online",
+        )
+        self._field = field
+        self._key = key
+        self._counts = None
+        self._attr_icon = "mdi:lan-connect"
+        self._update_state()
+
+    def _update_state(self):
+        counts = self.coordinator.stats.groups[self._field].get(self._key)
+        self._counts = tuple(counts) if counts else (0, 0, 0)
+        self._state = self._counts[1]
+
     @callback
     def _handle_coordinator_update(self):
+        """Write state only when one of the group's counts changed."""
+        old_counts = self._counts
         self._update_state()
+        available = self.available
+        if self._counts == old_counts and available == self._last_available:
+            return
+        self._last_available = available
         self.async_write_ha_state()
 
-    def _update_state(self):
-        hosts = self.coordinator.data.get("hosts", [])
-        self._state = sum(1 for h in hosts if h.get("known"))
+    @property
+    def extra_state_attributes(self):
+        total, online, known = self._counts
+        return {
+            self._field: self._key,
+            "total": total,
+            "offline": total - online,
+            "known": known,
+        }
 
 
-class WatchYourLANUnknownDevicesSensor(WatchYourLANBaseSensor):
-    """Example aggregator sensor: unknown devices."""
+class WatchYourLANHealthSensor(WatchYourLANBaseSensor):
+    """
+    Diagnostic sensor: whether WatchYourLAN is reachable. Stays available
+    while the server is down, since that is exactly what it reports.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = [HEALTH_OK, HEALTH_DEGRADED, HEALTH_STALE, HEALTH_DOWN]
 
     def __init__(self, coordinator, entry_id):
-        super().__init__(coordinator, entry_id, "Unknown Devices", "unknown_devices")
+        super().__init__(coordinator, entry_id, "Health", "health")
+        self._attr_icon = "mdi:lan-check"
         self._update_state()
 
+    @property
+    def available(self):
+        return True
+
+    def _update_state(self):
+        self._state = self.coordinator.health
+
+    @property
+    def extra_state_attributes(self):
+        last_success = self.coordinator.last_success_time
+        return {
+            "last_success": last_success.isoformat() if last_success else None,
+            "servers": {
+                url: breaker.state for url, breaker in self.coordinator.breakers.items()
+            },
+        }
+
+
+class WatchYourLANPollMetricsSensor(WatchYourLANBaseSensor):
+    """
+    Base for the poll instrumentation sensors. They refresh after every
+    poll, since quiet polls that change nothing are not dispatched to
+    regular coordinator listeners and are exactly the ones being timed.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_poll_listener(self._handle_poll_finished)
+        )
+
     @callback
-    def _handle_coordinator_update(self):
+    def _handle_poll_finished(self):
         self._update_state()
+        self._last_available = self.available
         self.async_write_ha_state()
 
+
+class WatchYourLANPollDurationSensor(WatchYourLANPollMetricsSensor):
+    """Diagnostic sensor: median poll duration, with per-stage percentiles."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    def __init__(self, coordinator, entry_id):
+        super().__init__(coordinator, entry_id, "Poll Duration", "poll_duration")
+        self._attr_icon = "mdi:timer-outline"
+        self._update_state()
+
     def _update_state(self):
-        hosts = self.coordinator.data.get("hosts", [])
-        self._state = sum(1 for h in hosts if not h.get("known"))
+        self._state = self.coordinator.metrics.summary("poll")["p50"]
+
+    @property
+    def extra_state_attributes(self):
+        """p50/p95/max (ms) for each stage of the poll."""
+        metrics = self.coordinator.metrics.as_dict()
+        return {
+            f"{stage}_{key}": value
+            for stage, summary in metrics["stages_ms"].items()
+            for key, value in summary.items()
+            if key != "samples"
+        }
+
+
+class WatchYourLANPayloadSizeSensor(WatchYourLANPollMetricsSensor):
+    """Diagnostic sensor: size of the last /api/all body."""
+
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+
+    def __init__(self, coordinator, entry_id):
+        super().__init__(coordinator, entry_id, "Payload Size", "payload_size")
+        self._attr_icon = "mdi:download-network-outline"
+        self._update_state()
+
+    def _update_state(self):
+        self._state = self.coordinator.metrics.payload_bytes
+
+    @property
+    def extra_state_attributes(self):
+        return {"hosts": self.coordinator.stats.total}
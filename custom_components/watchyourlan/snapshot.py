@@ -0,0 +1,63 @@
+"""Persistent cache of the last good host table, for fast restarts."""
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY, SNAPSHOT_STORAGE_VERSION
+from .hosts import Host
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HostSnapshotStore:
+    """
+    Saves the coordinator's host table through HA's storage helper.
+
+    Hosts are stored as rows of field values under a single header rather
+    than as one dict per host, and saves are debounced so a busy LAN does
+    not rewrite the file on every poll.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        self._store = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.hosts"
+        )
+        self._get_hosts = None
+
+    async def async_load(self):
+        """Return the cached Host list, or None if there is no usable cache."""
+        try:
+            data = await self._store.async_load()
+        except Exception as exc:
+            _LOGGER.warning("Ignoring unreadable WatchYourLAN host cache: %s", exc)
+            return None
+        if not data or data.get("fields") != list(Host.FIELDS):
+            return None
+        return [Host(*row) for row in data.get("hosts", [])]
+
+    @callback
+    def async_schedule_save(self, get_hosts):
+        """Save the hosts returned by get_hosts() after the debounce delay."""
+        self._get_hosts = get_hosts
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict:
+        get_hosts, self._get_hosts = self._get_hosts, None
+        return {
+            "fields": list(Host.FIELDS),
+            "hosts": [list(host.astuple()) for host in get_hosts()],
+        }
+
+    async def async_flush(self):
+        """
+        Write a pending save right away, which also cancels the delayed one.
+        Called on unload, so no write is left to recreate the file after
+        the entry is removed.
+        """
+        if self._get_hosts is not None:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self):
+        """Delete the cache, e.g. when the config entry is removed."""
+        await self._store.async_remove()
@@ -0,0 +1,142 @@
+"""
+Tracking rules: filters that select hosts to track without listing MACs.
+
+Rules are stored in the options as small dicts and compiled once into a
+TrackingMatcher, which the coordinator only evaluates for hosts that are
+new or changed in a field some rule looks at.
+"""
+import fnmatch
+import ipaddress
+import re
+
+from .hosts import normalize_mac
+
+KNOWN_ANY = "any"
+KNOWN_CHOICES = {KNOWN_ANY: "Any", "known": "Known", "unknown": "Unknown"}
+
+def build_rule(name="", vendor="", iface="", known=KNOWN_ANY, mac_prefix="", ip_network="") -> dict:
+    """
+    Build a rule from filter form values, leaving out empty criteria.
+
+    Raises ValueError if a criterion cannot be compiled.
+    """
+    rule = {}
+    if mac_prefix and mac_prefix.strip():
+        rule["mac_prefix"] = normalize_mac(mac_prefix)
+    if name and name.strip():
+        rule["name"] = name.strip()
+    if vendor and vendor.strip():
+        rule["vendor"] = vendor.strip()
+    if iface:
+        rule["iface"] = iface
+    if ip_network and ip_network.strip():
+        rule["ip_network"] = str(ipaddress.ip_network(ip_network.strip(), strict=False))
+    if known and known != KNOWN_ANY:
+        rule["known"] = known == "known"
+    _compile_rule(rule)
+    return rule
+
+
+def _name_pattern(name):
+    """Compile a name glob; without wildcards it matches as a substring."""
+    if not any(char in name for char in "*?["):
+        name = f"*{name}*"
+    return re.compile(fnmatch.translate(name), re.IGNORECASE).match
+
+
+def _vendor_pattern(vendor):
+    """Compile a case-insensitive vendor regular expression."""
+    try:
+        return re.compile(vendor, re.IGNORECASE).search
+    except re.error as err:
+        raise ValueError(f"Invalid vendor pattern {vendor!r}: {err}") from err
+
+
+def _in_network(network):
+    def _check(ip):
+        try:
+            return ipaddress.ip_address(ip) in network
+        except ValueError:
+            return False
+    return _check
+
+
+def _compile_rule(rule) -> tuple:
+    """
+    Compile a rule into (field, predicate) pairs, cheapest checks first.
+    Raises ValueError for an invalid pattern or network.
+    """
+    checks = []
+    if "known" in rule:
+        known = rule["known"]
+        checks.append(("known", lambda value: value == known))
+    if "iface" in rule:
+        iface = rule["iface"]
+        checks.append(("iface", lambda value: value == iface))
+    if "mac_prefix" in rule:
+        prefix = normalize_mac(rule["mac_prefix"])
+        checks.append(("mac", lambda value: normalize_mac(value).startswith(prefix)))
+    if "name" in rule:
+        match = _name_pattern(rule["name"])
+        checks.append(("name", lambda value: match(value or "") is not None))
+    if "vendor" in rule:
+        search = _vendor_pattern(rule["vendor"])
+        checks.append(("vendor", lambda value: search(value or "") is not None))
+    if "ip_network" in rule:
+        check = _in_network(ipaddress.ip_network(rule["ip_network"], strict=False))
+        checks.append(("ip", lambda value: bool(value) and check(value)))
+    return tuple(checks)
+
+
+class TrackingMatcher:
+    """
+    A set of tracking rules compiled once. A host is tracked if it
+    satisfies every criterion of at least one rule.
+    """
+
+    def __init__(self, rules=()):
+        compiled = {}
+        for rule in rules:
+            key = tuple(sorted(rule.items()))
+            if key in compiled:
+                continue
+            try:
+                compiled[key] = _compile_rule(rule)
+            except ValueError:
+                # Stored before validation existed, or hand-edited; skip it
+                continue
+        self._rules = tuple(compiled.values())
+        # Host fields any rule looks at; changes to others never affect a match
+        self.fields = frozenset(
+            field for checks in self._rules for field, _ in checks
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self._rules)
+
+    def matches(self, host) -> bool:
+        for checks in self._rules:
+            for field, check in checks:
+                if not check(getattr(host, field)):
+                    break
+            else:
+                return True
+        return False
+
+
+def describe_rule(rule) -> str:
+    """Return a short human-readable summary of a rule."""
+    parts = []
+    if "mac_prefix" in rule:
+        parts.append(f"MAC starts with {rule['mac_prefix']}")
+    if "name" in rule:
+        parts.append(f'name matches "{rule["name"]}"')
+    if "vendor" in rule:
+        parts.append(f'vendor matches "{rule["vendor"]}"')
+    if "iface" in rule:
+        parts.append(f"on {rule['iface']}")
+    if "ip_network" in rule:
+        parts.append(f"in {rule['ip_network']}")
+    if "known" in rule:
+        parts.append("known" if rule["known"] else "unknown")
+    return ", ".join(parts) or "all hosts"
@@ -0,0 +1,38 @@
+"""Helpers shared by the WatchYourLAN tests."""
+import asyncio
+
+
+class LoopMonitor:
+    """
+    Measures how long the event loop is blocked. A ticker asks to wake up
+    every interval; any extra delay is time something else held the loop.
+
+        async with LoopMonitor() as monitor:
+            await coordinator.async_refresh()
+        monitor.max_block
+    """
+
+    def __init__(self, interval=0.001):
+        self._interval = interval
+        self._task = None
+        self.max_block = 0.0
+
+    async def _tick(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self._interval
+            await asyncio.sleep(self._interval)
+            self.max_block = max(self.max_block, loop.time() - expected)
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._tick())
+        # Let the ticker take its first reading before the work starts
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
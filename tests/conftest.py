@@ -0,0 +1,83 @@
+"""Fixtures for the WatchYourLAN tests."""
+from collections import Counter
+
+import pytest
+from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.watchyourlan.const import DOMAIN
+
+from .fake_server import FakeLAN, FakeWatchYourLAN
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Load the integration from custom_components/ in every test."""
+    yield
+
+
+@pytest.fixture
+def lan_size(request) -> int:
+    """Number of hosts on the fake LAN; parametrize indirectly to change it."""
+    return getattr(request, "param", 100)
+
+
+@pytest.fixture
+async def fake_server(socket_enabled, lan_size):
+    """A running fake WatchYourLAN server on 127.0.0.1."""
+    server = FakeWatchYourLAN(FakeLAN(lan_size))
+    await server.start()
+    yield server
+    await server.stop()
+
+
+@pytest.fixture
+async def setup_integration(hass, fake_server):
+    """
+    Return a coroutine that adds a config entry for the fake server with
+    the given options and sets it up. Entries are unloaded afterwards, so
+    the shared session is closed before the server stops.
+    """
+    entries = []
+
+    async def _setup(options=None, scan_interval=60):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            title="WatchYourLAN (127.0.0.1)",
+            data={
+                CONF_HOST: "127.0.0.1",
+                CONF_PORT: fake_server.port,
+                CONF_SCAN_INTERVAL: scan_interval,
+            },
+            options=options or {},
+        )
+        entry.add_to_hass(hass)
+        entries.append(entry)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        return entry
+
+    yield _setup
+
+    for entry in entries:
+        # Tests may have removed the entry already
+        if hass.config_entries.async_get_entry(entry.entry_id) is not None:
+            await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@pytest.fixture
+def state_writes(monkeypatch) -> Counter:
+    """Count entity state writes per entity id, changed or not."""
+    writes = Counter()
+    write = Entity.async_write_ha_state
+
+    @callback
+    def _counting_write(self):
+        writes[self.entity_id] += 1
+        write(self)
+
+    monkeypatch.setattr(Entity, "async_write_ha_state", _counting_write)
+    return writes
@@ -0,0 +1,155 @@
+"""A fake WatchYourLAN server serving a synthetic LAN, for tests and benchmarks."""
+import hashlib
+import json
+import random
+from collections import Counter
+
+from aiohttp import web
+
+IFACES = ("eth0", "wlan0", "br0")
+VENDORS = ("Apple, Inc.", "Espressif Inc.", "Raspberry Pi Trading Ltd", "Intel Corporate", "")
+
+
+def fake_mac(index) -> str:
+    """Return a locally administered MAC address for the index-th host."""
+    return "02:00:" + ":".join(
+        f"{(index >> shift) & 0xFF:02x}" for shift in (24, 16, 8, 0)
+    )
+
+
+def fake_host(index, online, known) -> dict:
+    """Return one /api/all record the way WatchYourLAN reports it."""
+    return {
+        "ID": index + 1,
+        "Name": f"host-{index}",
+        "DNS": f"host-{index}.lan",
+        "Iface": IFACES[index % len(IFACES)],
+        "IP": f"10.{(index >> 16) & 0xFF}.{(index >> 8) & 0xFF}.{index & 0xFF}",
+        "Mac": fake_mac(index),
+        "Hw": VENDORS[index % len(VENDORS)],
+        "Date": "2024-01-01 00:00:00",
+        "Known": 1 if known else 0,
+        "Now": 1 if online else 0,
+    }
+
+
+class FakeLAN:
+    """
+    A synthetic LAN of WatchYourLAN host records. churn() flips the presence
+    of a share of the hosts, the way a real LAN drifts between polls.
+    """
+
+    def __init__(self, hosts, online_ratio=0.5, known_ratio=0.25, seed=0):
+        self._random = random.Random(seed)
+        self.hosts = [
+            fake_host(
+                index,
+                self._random.random() < online_ratio,
+                self._random.random() < known_ratio,
+            )
+            for index in range(hosts)
+        ]
+
+    def macs(self, count) -> list:
+        """Return the MACs of the first count hosts."""
+        return [host["Mac"] for host in self.hosts[:count]]
+
+    def churn(self, ratio) -> set:
+        """Flip the presence of ratio * hosts random hosts; returns their MACs."""
+        count = round(len(self.hosts) * ratio)
+        flipped = set()
+        for host in self._random.sample(self.hosts, count):
+            host["Now"] = 0 if host["Now"] else 1
+            flipped.add(host["Mac"])
+        return flipped
+
+
+class FakeWatchYourLAN:
+    """
+    Serves /api/all, /api/host/<id> and /api/status/ for a FakeLAN on a
+    local port.
+
+    The /api/all body is rendered ahead of time (see render()), so the
+    server adds as little as possible to what a poll measures. It sends an
+    ETag unless etag=False, answers /api/all with status when that is set
+    to anything but 200, and counts requests per path and the client
+    sockets they arrived on.
+    """
+
+    def __init__(self, lan: FakeLAN, etag=True):
+        self.lan = lan
+        self.etag = etag
+        self.status = 200
+        self.requests = Counter()
+        self.peers = set()
+        self.port = None
+        self._body = b""
+        self._tag = None
+
+        app = web.Application()
+        app.router.add_get("/api/all", self._handle_all)
+        app.router.add_get("/api/host/{id}", self._handle_host)
+        app.router.add_get("/api/status/", self._handle_status)
+        self._runner = web.AppRunner(app)
+        self.render()
+
+    @property
+    def body_size(self) -> int:
+        return len(self._body)
+
+    async def start(self):
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+    async def stop(self):
+        await self._runner.cleanup()
+
+    def render(self):
+        """Serialize the LAN again; call after changing it."""
+        self._body = json.dumps(self.lan.hosts).encode()
+        self._tag = '"%s"' % hashlib.blake2b(self._body, digest_size=8).hexdigest()
+
+    def churn(self, ratio) -> set:
+        """Churn the LAN and serve the result; returns the flipped MACs."""
+        flipped = self.lan.churn(ratio)
+        self.render()
+        return flipped
+
+    def _record(self, request):
+        self.requests[request.path] += 1
+        self.peers.add(request.transport.get_extra_info("peername"))
+
+    async def _handle_all(self, request):
+        self._record(request)
+        if self.status != 200:
+            return web.Response(status=self.status)
+        headers = {}
+        if self.etag:
+            if request.headers.get("If-None-Match") == self._tag:
+                return web.Response(status=304)
+            headers["ETag"] = self._tag
+        return web.Response(
+            body=self._body, content_type="application/json", headers=headers
+        )
+
+    async def _handle_host(self, request):
+        self._record(request)
+        index = int(request.match_info["id"]) - 1
+        if not 0 <= index < len(self.lan.hosts):
+            return web.Response(status=404)
+        return web.json_response(self.lan.hosts[index])
+
+    async def _handle_status(self, request):
+        self._record(request)
+        hosts = self.lan.hosts
+        online = sum(1 for host in hosts if host["Now"])
+        known = sum(1 for host in hosts if host["Known"])
+        return web.json_response({
+            "Total": len(hosts),
+            "Online": online,
+            "Offline": len(hosts) - online,
+            "Known": known,
+            "Unknown": len(hosts) - known,
+        })
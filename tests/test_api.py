@@ -0,0 +1,38 @@
+"""Tests for the shared, pooled WatchYourLAN HTTP session."""
+from custom_components.watchyourlan.api import DATA_SESSION
+from custom_components.watchyourlan.const import DOMAIN
+
+
+async def test_polls_reuse_one_connection(hass, fake_server, setup_integration):
+    """Successive polls go over the same keep-alive connection."""
+    entry = await setup_integration()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    for _ in range(3):
+        fake_server.churn(0.05)
+        await coordinator.async_refresh()
+    # Polls of an unchanged LAN
+    for _ in range(2):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    # One request at setup, then one per poll
+    assert fake_server.requests["/api/all"] == 6
+    assert len(fake_server.peers) == 1
+
+
+async def test_entries_share_one_session(hass, fake_server, setup_integration):
+    """All entries poll through one session, closed with the last entry."""
+    first = await setup_integration()
+    second = await setup_integration()
+    session = hass.data[DATA_SESSION]
+    for entry in (first, second):
+        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+        assert all(client._session is session for client in coordinator._clients)
+
+    await hass.config_entries.async_unload(first.entry_id)
+    assert not session.closed
+
+    await hass.config_entries.async_unload(second.entry_id)
+    assert session.closed
+    assert DATA_SESSION not in hass.data
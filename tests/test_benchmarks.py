@@ -0,0 +1,134 @@
+"""
+Benchmarks of the synchronous hot paths of a poll on synthetic LANs, timed
+with pytest-benchmark or measured with tracemalloc. Each one also fails
+when it exceeds its budget, so CI catches regressions.
+"""
+import gc
+import json
+import tracemalloc
+
+import pytest
+
+from custom_components.watchyourlan.api import json_loads
+from custom_components.watchyourlan.hosts import HostStats, build_hosts, diff_hosts
+
+from .fake_server import FakeLAN
+
+HOST_COUNTS = [100, 1_000, 10_000, 50_000]
+CHURN = 0.01
+
+# Median budgets, in seconds per host on the LAN
+NORMALIZE_BUDGET = 6e-6
+DIFF_BUDGET = 3e-6
+DECODE_BUDGET = 6e-6
+# Host records against the plain dicts they replaced, in retained bytes
+HOST_RECORD_MEMORY_RATIO = 0.6
+
+
+def _assert_median_within(benchmark, budget):
+    if benchmark.disabled:
+        return
+    assert benchmark.stats.stats.median <= budget
+
+
+def _retained(build):
+    """Return what build() returns and the bytes it still holds on to."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    return result, retained
+
+
+def _host_dicts(payload) -> list:
+    """Normalize a payload into one dict per host, as the integration used to."""
+    return [
+        {
+            "id": item.get("ID"),
+            "mac": item.get("Mac"),
+            "name": item.get("Name") or "",
+            "online": bool(item.get("Now")),
+            "known": bool(item.get("Known")),
+            "ip": item.get("IP"),
+            "vendor": item.get("Hw"),
+            "iface": item.get("Iface"),
+            "dns": item.get("DNS"),
+            "date": item.get("Date"),
+        }
+        for item in payload
+    ]
+
+
+def _churned_tables(hosts):
+    """Return the host index before and the raw payload after one churned poll."""
+    lan = FakeLAN(hosts)
+    _, previous = build_hosts(lan.hosts)
+    lan.churn(CHURN)
+    return previous, lan.hosts
+
+
+@pytest.mark.parametrize("hosts", HOST_COUNTS)
+def test_decode_payload(benchmark, hosts, record_property):
+    """Decode an /api/all body with the JSON backend in use (orjson when installed)."""
+    body = json.dumps(FakeLAN(hosts).hosts).encode()
+
+    payload = benchmark(json_loads, body)
+
+    record_property("payload_bytes", len(body))
+    assert len(payload) == hosts
+    _assert_median_within(benchmark, DECODE_BUDGET * hosts)
+
+
+@pytest.mark.parametrize("hosts", HOST_COUNTS)
+def test_normalize_churned_poll(benchmark, hosts):
+    """Normalize a decoded /api/all payload, reusing the unchanged hosts."""
+    previous, payload = _churned_tables(hosts)
+
+    _, index = benchmark(build_hosts, payload, previous)
+
+    assert len(index) == hosts
+    _assert_median_within(benchmark, NORMALIZE_BUDGET * hosts)
+
+
+@pytest.mark.parametrize("hosts", HOST_COUNTS)
+def test_diff_and_count_churned_poll(benchmark, hosts):
+    """Diff a churned table and fold the diff into the hub counters."""
+    previous, payload = _churned_tables(hosts)
+    _, current = build_hosts(payload, previous)
+    stats = HostStats()
+    stats.apply_diff(diff_hosts(None, previous), {}, previous)
+
+    def _diff_and_count():
+        diff = diff_hosts(previous, current)
+        # Apply and revert, so every round starts from the same counters
+        stats.apply_diff(diff, previous, current)
+        stats.apply_diff(diff_hosts(current, previous), current, previous)
+        return diff
+
+    diff = benchmark(_diff_and_count)
+
+    assert len(diff.changed) == round(hosts * CHURN)
+    _assert_median_within(benchmark, DIFF_BUDGET * hosts)
+
+
+@pytest.mark.parametrize("hosts", [1_000, 10_000])
+def test_host_record_memory(hosts, record_property):
+    """Host records take well under the memory of per-host dicts, and are reused."""
+    payload = FakeLAN(hosts).hosts
+
+    _, dict_bytes = _retained(lambda: _host_dicts(payload))
+    records, record_bytes = _retained(lambda: build_hosts(payload)[0])
+    _, index = build_hosts(payload)
+    (_, reused), _ = _retained(lambda: build_hosts(payload, index))
+
+    record_property("dict_bytes_per_host", dict_bytes // hosts)
+    record_property("record_bytes_per_host", record_bytes // hosts)
+    assert len(records) == hosts
+    assert record_bytes <= HOST_RECORD_MEMORY_RATIO * dict_bytes
+    # An unchanged poll keeps every record instead of building new ones
+    assert all(reused[mac] is host for mac, host in index.items())
@@ -0,0 +1,44 @@
+"""Tests for the WatchYourLAN options flow."""
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.watchyourlan.const import CONF_PRESENCE_OVERRIDES
+
+
+async def _async_presence_form(hass, entry):
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == FlowResultType.MENU
+    return await hass.config_entries.options.async_configure(
+        result["flow_id"], {"next_step_id": "presence"}
+    )
+
+
+async def test_presence_override_for_tracked_device(hass, fake_server, setup_integration):
+    """An override is saved for a tracked MAC, in any spelling."""
+    mac = fake_server.lan.hosts[0]["Mac"]
+    entry = await setup_integration({"devices_to_track": [mac]})
+
+    result = await _async_presence_form(hass, entry)
+    assert result["type"] == FlowResultType.FORM
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {"device": mac.upper().replace(":", "-"), "device_consider_home": 120},
+    )
+
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_PRESENCE_OVERRIDES][mac]["consider_home"] == 120
+
+
+async def test_presence_override_rejects_untracked_device(
+    hass, fake_server, setup_integration
+):
+    """A MAC that is neither tracked nor overridden is refused."""
+    tracked, untracked = fake_server.lan.macs(2)
+    entry = await setup_integration({"devices_to_track": [tracked]})
+
+    result = await _async_presence_form(hass, entry)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {"device": untracked, "device_consider_home": 120}
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"device": "unknown_device"}
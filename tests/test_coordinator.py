@@ -0,0 +1,55 @@
+"""Tests for stale-data serving and health of the WatchYourLAN coordinator."""
+from custom_components.watchyourlan.const import (
+    BREAKER_FAILURE_THRESHOLD,
+    CONF_MAX_STALE_AGE,
+    DOMAIN,
+    HEALTH_DOWN,
+    HEALTH_OK,
+    HEALTH_STALE,
+)
+
+MAX_STALE_AGE = 300
+
+
+async def _setup(hass, setup_integration):
+    entry = await setup_integration({CONF_MAX_STALE_AGE: MAX_STALE_AGE})
+    return hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+
+async def test_stale_data_served_until_max_age(hass, fake_server, setup_integration):
+    """A failed poll keeps the last table until it is older than max_stale_age."""
+    coordinator = await _setup(hass, setup_integration)
+    hosts = coordinator.data["hosts"]
+    fake_server.status = 500
+
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.health == HEALTH_STALE
+    assert coordinator.data["health"] == HEALTH_STALE
+    assert coordinator.data["hosts"] is hosts
+
+    coordinator._last_success -= MAX_STALE_AGE + 1
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert coordinator.health == HEALTH_DOWN
+
+    fake_server.status = 200
+    fake_server.churn(0.1)
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.health == HEALTH_OK
+    assert coordinator.data["health"] == HEALTH_OK
+
+
+async def test_open_circuit_stops_requests(hass, fake_server, setup_integration):
+    """After repeated failures the server is left alone for the cooldown."""
+    coordinator = await _setup(hass, setup_integration)
+    fake_server.status = 500
+
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        await coordinator.async_refresh()
+    requests = fake_server.requests["/api/all"]
+    await coordinator.async_refresh()
+
+    assert fake_server.requests["/api/all"] == requests
+    assert coordinator.health == HEALTH_STALE
@@ -0,0 +1,24 @@
+"""Tests for the WatchYourLAN diagnostics download."""
+from homeassistant.components.diagnostics import REDACTED
+
+from custom_components.watchyourlan.const import DOMAIN
+from custom_components.watchyourlan.diagnostics import async_get_config_entry_diagnostics
+
+
+async def test_diagnostics_leave_out_hosts(hass, fake_server, setup_integration):
+    """Diagnostics carry counts and timings, not MACs, addresses or names."""
+    mac = fake_server.lan.hosts[0]["Mac"]
+    entry = await setup_integration({"devices_to_track": [mac]})
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["hosts"] == len(fake_server.lan.hosts)
+    assert diagnostics["tracked"] == 1
+    assert diagnostics["metrics"]["payload_bytes"] == fake_server.body_size
+    assert diagnostics["options"]["devices_to_track"] == REDACTED
+    dumped = repr(diagnostics)
+    for host in fake_server.lan.hosts:
+        assert host["Mac"] not in dumped
+        assert host["IP"] not in dumped
+        assert host["Name"] not in dumped
+    assert hass.data[DOMAIN][entry.entry_id]["coordinator"]._clients[0].base_url not in dumped
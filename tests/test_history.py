@@ -0,0 +1,82 @@
+"""Tests for the per-host presence history."""
+from custom_components.watchyourlan.history import PresenceHistory
+
+MAC = "aa:bb:cc:dd:ee:01"
+
+
+def test_records_only_changes():
+    history = PresenceHistory(size=8, window=100)
+
+    history.record(MAC, True, 910)
+    history.record(MAC, True, 920)
+    history.record(MAC, False, 930)
+    history.record(MAC, False, 940)
+
+    assert history.transitions(MAC) == [910, -930]
+    assert history.transitions("aa:bb:cc:dd:ee:02") == []
+
+
+def test_ring_keeps_the_last_transitions():
+    history = PresenceHistory(size=4, window=1000)
+
+    for i in range(10):
+        history.record(MAC, i % 2 == 0, 910 + 10 * i)
+
+    assert history.transitions(MAC) == [970, -980, 990, -1000]
+
+
+def test_last_seen():
+    history = PresenceHistory(size=4, window=100)
+
+    history.record(MAC, False, 900)
+    assert history.last_seen(MAC, 1000) is None
+    history.record(MAC, True, 910)
+    assert history.last_seen(MAC, 1000) == 1000
+    history.record(MAC, False, 920)
+    assert history.last_seen(MAC, 1000) == 920
+
+
+def test_host_stats():
+    """The first entry is the initial state, not a flap."""
+    history = PresenceHistory(size=8, window=100)
+
+    history.record(MAC, True, 920)
+    history.record(MAC, False, 950)
+    history.record(MAC, True, 980)
+
+    assert history.host_stats(MAC, 1000) == {"online_seconds": 50, "flaps": 2}
+    assert history.host_stats("aa:bb:cc:dd:ee:02", 1000) == {
+        "online_seconds": 0,
+        "flaps": 0,
+    }
+
+
+def test_host_stats_outside_window():
+    """Transitions before the window only set the state it starts in."""
+    history = PresenceHistory(size=8, window=100)
+
+    history.record(MAC, True, 800)
+    history.record(MAC, False, 950)
+
+    assert history.host_stats(MAC, 1000) == {"online_seconds": 50, "flaps": 1}
+
+
+def test_host_stats_after_wrap():
+    """Once the ring wrapped, the state before the oldest entry is inferred."""
+    history = PresenceHistory(size=4, window=100)
+
+    for i in range(5):
+        history.record(MAC, i % 2 == 0, 910 + 10 * i)
+
+    # Kept: -920, 930, -940, 950, so the host was online from the window start
+    assert history.host_stats(MAC, 1000) == {"online_seconds": 80, "flaps": 4}
+
+
+def test_forget():
+    history = PresenceHistory(size=4, window=100)
+    history.record(MAC, True, 910)
+
+    history.forget(MAC)
+
+    assert history.transitions(MAC) == []
+    assert history.last_seen(MAC, 1000) is None
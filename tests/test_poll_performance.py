@@ -0,0 +1,221 @@
+"""
+End-to-end poll benchmarks: the coordinator and all three platforms in a
+test Home Assistant, polling a fake WatchYourLAN server with 100 to 50k
+hosts.
+
+Each test reports its measurements with record_property (they end up in
+the JUnit report) and fails when a budget below is exceeded. pytest-benchmark
+cannot drive coroutines on Home Assistant's loop, so the loop-bound paths
+are timed by hand here; the synchronous hot paths are in test_benchmarks.py.
+"""
+import gc
+import statistics
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from custom_components.watchyourlan.const import DOMAIN, PARSE_IN_EXECUTOR_BYTES
+from custom_components.watchyourlan.hosts import normalize_mac
+
+from .common import LoopMonitor
+
+HOST_COUNTS = [100, 1_000, 10_000, 50_000]
+
+# Hosts with their own entities (a presence binary sensor and a device tracker)
+TRACKED_HOSTS = 250
+# Share of the LAN that changes presence between two polls
+CHURN = 0.01
+POLLS = 5
+
+# CI budgets: a fixed part plus a part per host on the LAN. Loose enough for
+# a shared runner, tight enough to catch a hot path going quadratic or
+# every entity being written on every poll.
+POLL_LATENCY_BUDGET = (0.25, 25e-6)  # seconds
+UNCHANGED_POLL_BUDGET = (0.05, 2e-6)  # seconds
+LOOP_BLOCK_BUDGET = (0.1, 3e-6)  # seconds
+RETAINED_MEMORY_BUDGET = (2 * 1024**2, 3 * 1024)  # bytes, allocated by the integration
+PEAK_MEMORY_BUDGET = (32 * 1024**2, 16 * 1024)  # bytes, whole process
+# Entity callbacks of one poll, for a fixed number of tracked hosts; the
+# same for every LAN size, since entities look their host up by MAC
+DISPATCH_BUDGET = 0.02  # seconds
+# Entity callbacks per state written, when every tracked host changes
+WRITE_COST_BUDGET = 0.5e-3  # seconds
+
+pytestmark = pytest.mark.parametrize("lan_size", HOST_COUNTS, indirect=True)
+
+
+def _budget(budget, hosts) -> float:
+    fixed, per_host = budget
+    return fixed + per_host * hosts
+
+
+async def _setup_tracked(hass, fake_server, setup_integration):
+    """Set up an entry tracking the first TRACKED_HOSTS hosts; return the coordinator."""
+    entry = await setup_integration(
+        {"devices_to_track": fake_server.lan.macs(TRACKED_HOSTS)}
+    )
+    return hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+
+async def _timed_refresh(hass, coordinator):
+    """Poll once; return the wall time and the longest event loop block."""
+    async with LoopMonitor() as monitor:
+        started = time.perf_counter()
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - started
+    assert coordinator.last_update_success
+    return elapsed, monitor.max_block
+
+
+async def test_churn_poll_latency(
+    hass, fake_server, setup_integration, lan_size, record_property
+):
+    """Polls where 1% of the LAN changed stay within the latency and loop budgets."""
+    coordinator = await _setup_tracked(hass, fake_server, setup_integration)
+
+    latencies = []
+    blocks = []
+    for _ in range(POLLS):
+        fake_server.churn(CHURN)
+        elapsed, block = await _timed_refresh(hass, coordinator)
+        latencies.append(elapsed)
+        blocks.append(block)
+
+    latency = statistics.median(latencies)
+    record_property("payload_bytes", fake_server.body_size)
+    record_property("poll_latency_s", round(latency, 4))
+    record_property("loop_block_s", round(max(blocks), 4))
+    assert latency <= _budget(POLL_LATENCY_BUDGET, lan_size)
+    assert max(blocks) <= _budget(LOOP_BLOCK_BUDGET, lan_size)
+
+
+async def test_decode_thread_and_loop_block(
+    hass, fake_server, setup_integration, lan_size, monkeypatch, record_property
+):
+    """Bodies above the threshold are decoded in the executor, smaller ones inline."""
+    coordinator = await _setup_tracked(hass, fake_server, setup_integration)
+    loop_thread = threading.get_ident()
+    threads = []
+    decode = coordinator._decode
+
+    def _tracking_decode(body, previous):
+        threads.append(threading.get_ident())
+        return decode(body, previous)
+
+    monkeypatch.setattr(coordinator, "_decode", _tracking_decode)
+    blocks = []
+    for _ in range(POLLS):
+        fake_server.churn(CHURN)
+        _, block = await _timed_refresh(hass, coordinator)
+        blocks.append(block)
+
+    parse = coordinator.metrics.summary("parse")["p50"] / 1000
+    normalize = coordinator.metrics.summary("normalize")["p50"] / 1000
+    record_property("payload_bytes", fake_server.body_size)
+    record_property("decode_s", round(parse + normalize, 4))
+    record_property("loop_block_s", round(statistics.median(blocks), 4))
+    in_executor = fake_server.body_size >= PARSE_IN_EXECUTOR_BYTES
+    assert len(threads) == POLLS
+    assert all((ident != loop_thread) is in_executor for ident in threads)
+
+
+async def test_dispatch_time_is_flat(
+    hass, fake_server, setup_integration, lan_size, record_property
+):
+    """Entity callbacks per poll do not grow with the number of hosts on the LAN."""
+    coordinator = await _setup_tracked(hass, fake_server, setup_integration)
+
+    for _ in range(POLLS):
+        fake_server.churn(CHURN)
+        await _timed_refresh(hass, coordinator)
+
+    dispatch = coordinator.metrics.summary("dispatch")["p50"] / 1000
+    record_property("dispatch_s", dispatch)
+    assert dispatch <= DISPATCH_BUDGET
+
+
+async def test_state_write_cost(
+    hass, fake_server, setup_integration, state_writes, lan_size, record_property
+):
+    """Writing the state of every tracked host stays cheap per entity."""
+    coordinator = await _setup_tracked(hass, fake_server, setup_integration)
+    tracked = fake_server.lan.hosts[:TRACKED_HOSTS]
+    state_writes.clear()
+
+    for _ in range(POLLS):
+        for host in tracked:
+            host["Now"] = 0 if host["Now"] else 1
+        fake_server.render()
+        await _timed_refresh(hass, coordinator)
+
+    writes = sum(state_writes.values()) / POLLS
+    dispatch = coordinator.metrics.summary("dispatch")["p50"] / 1000
+    record_property("state_writes", writes)
+    record_property("write_cost_s", round(dispatch / writes, 6))
+    assert writes >= 2 * len(tracked)
+    assert dispatch / writes <= WRITE_COST_BUDGET
+
+
+async def test_unchanged_poll(
+    hass, fake_server, setup_integration, state_writes, lan_size, record_property
+):
+    """An unchanged LAN is answered with a 304 and writes no state at all."""
+    coordinator = await _setup_tracked(hass, fake_server, setup_integration)
+    requests = fake_server.requests["/api/all"]
+    state_writes.clear()
+
+    elapsed, block = await _timed_refresh(hass, coordinator)
+
+    record_property("poll_latency_s", round(elapsed, 4))
+    record_property("loop_block_s", round(block, 4))
+    assert fake_server.requests["/api/all"] == requests + 1
+    assert sum(state_writes.values()) == 0
+    assert elapsed <= _budget(UNCHANGED_POLL_BUDGET, lan_size)
+
+
+async def test_state_writes_per_poll(
+    hass, fake_server, setup_integration, state_writes, lan_size, record_property
+):
+    """Only the hub sensors and the entities of hosts that changed are written."""
+    coordinator = await _setup_tracked(hass, fake_server, setup_integration)
+    tracked = {normalize_mac(mac) for mac in fake_server.lan.macs(TRACKED_HOSTS)}
+    hub_sensors = len(hass.states.async_entity_ids("sensor"))
+    state_writes.clear()
+
+    flipped = {normalize_mac(mac) for mac in fake_server.churn(CHURN)}
+    await _timed_refresh(hass, coordinator)
+
+    changed = len(flipped & tracked)
+    writes = sum(state_writes.values())
+    record_property("state_writes", writes)
+    record_property("tracked_hosts_changed", changed)
+    # A presence binary sensor and a device tracker per changed tracked host
+    assert writes >= 2 * changed
+    assert writes <= 2 * changed + hub_sensors
+
+
+async def test_memory_per_host(
+    hass, fake_server, setup_integration, lan_size, record_property
+):
+    """Memory kept by the integration grows by a bounded amount per host."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        await _setup_tracked(hass, fake_server, setup_integration)
+        gc.collect()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(True, "*/custom_components/watchyourlan/*")]
+        )
+    finally:
+        tracemalloc.stop()
+
+    retained = sum(stat.size for stat in snapshot.statistics("filename"))
+    record_property("retained_bytes_per_host", retained // lan_size)
+    record_property("peak_bytes_per_host", peak // lan_size)
+    assert retained <= _budget(RETAINED_MEMORY_BUDGET, lan_size)
+    assert peak <= _budget(PEAK_MEMORY_BUDGET, lan_size)
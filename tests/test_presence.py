@@ -0,0 +1,136 @@
+"""Tests for debounced presence."""
+from custom_components.watchyourlan.const import (
+    CONF_CONSIDER_HOME,
+    CONF_MIN_CONSECUTIVE_SEEN,
+    CONF_PRESENCE_OVERRIDES,
+    DOMAIN,
+)
+from custom_components.watchyourlan.presence import PresenceDebouncer, build_debouncer
+
+MAC = "aa:bb:cc:dd:ee:01"
+OTHER = "aa:bb:cc:dd:ee:02"
+
+
+async def test_removed_hosts_are_forgotten(hass, fake_server, setup_integration):
+    """Hosts that leave the table leave no debouncer state behind."""
+    entry = await setup_integration()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    removed = fake_server.lan.hosts[-10:]
+    del fake_server.lan.hosts[-10:]
+    fake_server.render()
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    for host in removed:
+        assert host["Mac"] not in coordinator.presence._present
+        assert host["Mac"] not in coordinator.presence._streak
+    assert len(coordinator.presence._present) == len(fake_server.lan.hosts)
+
+
+def test_first_sighting_is_taken_as_is():
+    debouncer = PresenceDebouncer(180, 3)
+
+    assert not debouncer.observe(MAC, True, 0)
+    assert not debouncer.observe(OTHER, False, 0)
+
+    assert debouncer.is_present(MAC)
+    assert not debouncer.is_present(OTHER)
+
+
+def test_min_consecutive_seen():
+    """A host comes home only after enough sightings in a row."""
+    debouncer = PresenceDebouncer(0, 3)
+    debouncer.observe(MAC, False, 0)
+
+    assert not debouncer.observe(MAC, True, 10)
+    assert not debouncer.observe(MAC, True, 20)
+    assert debouncer.arming() == [MAC]
+    assert not debouncer.observe(MAC, False, 30)
+    assert debouncer.arming() == []
+
+    assert not debouncer.observe(MAC, True, 40)
+    assert not debouncer.observe(MAC, True, 50)
+    assert debouncer.observe(MAC, True, 60)
+    assert debouncer.is_present(MAC)
+    assert debouncer.arming() == []
+
+
+def test_consider_home_grace_window():
+    """A host is away only once its grace window has run out."""
+    debouncer = PresenceDebouncer(180, 1)
+    debouncer.observe(MAC, True, 0)
+    debouncer.observe(OTHER, True, 0)
+
+    assert not debouncer.observe(MAC, False, 100)
+    assert not debouncer.observe(OTHER, False, 150)
+    assert not debouncer.observe(MAC, False, 200)
+    assert debouncer.is_pending(MAC)
+    assert debouncer.is_present(MAC)
+    assert debouncer.next_deadline() == 280
+
+    assert debouncer.expire(279) == []
+    assert debouncer.expire(280) == [MAC]
+    assert not debouncer.is_present(MAC)
+    assert not debouncer.is_pending(MAC)
+    assert debouncer.next_deadline() == 330
+
+
+def test_back_online_cancels_grace_window():
+    debouncer = PresenceDebouncer(180, 1)
+    debouncer.observe(MAC, True, 0)
+    debouncer.observe(MAC, False, 100)
+
+    assert not debouncer.observe(MAC, True, 150)
+
+    assert not debouncer.is_pending(MAC)
+    assert debouncer.next_deadline() is None
+    assert debouncer.expire(1000) == []
+    assert debouncer.is_present(MAC)
+
+
+def test_zero_consider_home_flips_immediately():
+    debouncer = PresenceDebouncer(0, 1)
+    debouncer.observe(MAC, True, 0)
+
+    assert debouncer.observe(MAC, False, 10)
+    assert not debouncer.is_present(MAC)
+    assert not debouncer.is_pending(MAC)
+
+
+def test_per_device_overrides():
+    """Overrides from the options apply to their MAC only, in any spelling."""
+    debouncer = build_debouncer({
+        CONF_CONSIDER_HOME: 180,
+        CONF_MIN_CONSECUTIVE_SEEN: 1,
+        CONF_PRESENCE_OVERRIDES: {
+            MAC.upper(): {CONF_CONSIDER_HOME: 0, CONF_MIN_CONSECUTIVE_SEEN: 2},
+        },
+    })
+    for mac in (MAC, OTHER):
+        debouncer.observe(mac, True, 0)
+
+    assert debouncer.observe(MAC, False, 10)
+    assert not debouncer.observe(OTHER, False, 10)
+    assert debouncer.is_pending(OTHER)
+
+    assert not debouncer.observe(MAC, True, 20)
+    assert debouncer.observe(MAC, True, 30)
+
+
+def test_forget():
+    debouncer = PresenceDebouncer(180, 2)
+    debouncer.observe(MAC, True, 0)
+    debouncer.observe(MAC, False, 10)
+    debouncer.observe(OTHER, False, 0)
+    debouncer.observe(OTHER, True, 10)
+
+    debouncer.forget(MAC)
+    debouncer.forget(OTHER)
+
+    assert not debouncer.is_pending(MAC)
+    assert debouncer.arming() == []
+    assert debouncer.next_deadline() is None
+    # Seen again, a forgotten host is a first sighting
+    assert not debouncer.observe(MAC, False, 20)
+    assert not debouncer.is_present(MAC)
@@ -0,0 +1,128 @@
+"""Tests for pushed host events through the WatchYourLAN webhook."""
+from datetime import timedelta
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.watchyourlan.const import (
+    CONF_PUSH_UPDATES,
+    CONF_WEBHOOK_ID,
+    DEFAULT_RECONCILE_INTERVAL,
+    DOMAIN,
+)
+
+WEBHOOK_ID = "watchyourlan_test"
+WEBHOOK_URL = f"/api/webhook/{WEBHOOK_ID}"
+
+
+@pytest.fixture
+async def push_entry(hass, fake_server, setup_integration):
+    """An entry with push updates on, tracking the first 10 hosts."""
+    return await setup_integration({
+        CONF_PUSH_UPDATES: True,
+        CONF_WEBHOOK_ID: WEBHOOK_ID,
+        "devices_to_track": fake_server.lan.macs(10),
+    })
+
+
+def _assert_stats_match_table(coordinator):
+    hosts = coordinator.data["hosts"]
+    assert coordinator.stats.total == len(hosts)
+    assert coordinator.stats.online == sum(1 for host in hosts if host.online)
+    assert coordinator.stats.known == sum(1 for host in hosts if host.known)
+
+
+async def test_pushed_event_updates_host(
+    hass, fake_server, push_entry, hass_client_no_auth
+):
+    """A pushed event changes the host, the hub counters and its entity."""
+    coordinator = hass.data[DOMAIN][push_entry.entry_id]["coordinator"]
+    host = fake_server.lan.hosts[0]
+    mac = host["Mac"]
+    online = not host["Now"]
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "binary_sensor", DOMAIN, f"watchyourlan_binary_sensor_{mac}"
+    )
+    client = await hass_client_no_auth()
+
+    resp = await client.post(WEBHOOK_URL, json={"mac": mac.upper(), "online": online})
+    await hass.async_block_till_done()
+
+    assert resp.status == 200
+    assert coordinator.data["hosts_by_mac"][mac].online is online
+    assert hass.states.get(entity_id).state == ("on" if online else "off")
+    _assert_stats_match_table(coordinator)
+
+
+async def test_pushed_batch_and_invalid_payloads(
+    hass, fake_server, push_entry, hass_client_no_auth
+):
+    """Batches are applied together; malformed payloads are rejected."""
+    coordinator = hass.data[DOMAIN][push_entry.entry_id]["coordinator"]
+    hosts = fake_server.lan.hosts[:5]
+    client = await hass_client_no_auth()
+
+    resp = await client.post(WEBHOOK_URL, json={
+        "hosts": [{"mac": host["Mac"], "online": not host["Now"]} for host in hosts]
+    })
+    assert resp.status == 200
+    for host in hosts:
+        assert coordinator.data["hosts_by_mac"][host["Mac"]].online is not bool(host["Now"])
+    _assert_stats_match_table(coordinator)
+
+    resp = await client.post(WEBHOOK_URL, data="not json")
+    assert resp.status == 400
+    resp = await client.post(WEBHOOK_URL, json=["not an event"])
+    assert resp.status == 400
+
+
+async def test_push_keeps_reconcile_schedule(
+    hass, fake_server, push_entry, hass_client_no_auth, freezer
+):
+    """A push does not postpone the next reconciliation poll."""
+    host = fake_server.lan.hosts[0]
+    client = await hass_client_no_auth()
+    requests = fake_server.requests["/api/all"]
+
+    freezer.tick(timedelta(seconds=DEFAULT_RECONCILE_INTERVAL - 60))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    resp = await client.post(WEBHOOK_URL, json={"mac": host["Mac"], "online": not host["Now"]})
+    assert resp.status == 200
+    assert fake_server.requests["/api/all"] == requests
+
+    freezer.tick(timedelta(seconds=120))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert fake_server.requests["/api/all"] == requests + 1
+
+
+async def test_push_while_poll_decodes(
+    hass, fake_server, push_entry, hass_client_no_auth, monkeypatch
+):
+    """A push that lands while a polled body is decoded is not counted twice."""
+    coordinator = hass.data[DOMAIN][push_entry.entry_id]["coordinator"]
+    pushed = fake_server.lan.hosts[-1]
+    client = await hass_client_no_auth()
+    fake_server.churn(0.1)
+
+    decode = coordinator._async_decode
+
+    async def _decode_then_push(body, previous):
+        data = await decode(body, previous)
+        resp = await client.post(
+            WEBHOOK_URL, json={"mac": pushed["Mac"], "online": not pushed["Now"]}
+        )
+        assert resp.status == 200
+        return data
+
+    monkeypatch.setattr(coordinator, "_async_decode", _decode_then_push)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success
+    # The poll is authoritative: the server never reported the pushed change
+    assert coordinator.data["hosts_by_mac"][pushed["Mac"]].online is bool(pushed["Now"])
+    _assert_stats_match_table(coordinator)
@@ -0,0 +1,145 @@
+"""Tests for retries and the circuit breaker."""
+import asyncio
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+
+from custom_components.watchyourlan import resilience
+from custom_components.watchyourlan.api import WatchYourLANApiError
+from custom_components.watchyourlan.resilience import CircuitBreaker, async_retry
+
+
+class FakeClock:
+    """Stands in for the time module, with a monotonic clock moved by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(resilience, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def sleeps(monkeypatch) -> list:
+    """Record retry delays instead of sleeping."""
+    delays = []
+
+    async def _sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(resilience, "asyncio", SimpleNamespace(sleep=_sleep))
+    return delays
+
+
+def _failing(errors, result="ok"):
+    """Return a call that raises the given errors in turn, then returns result."""
+    calls = []
+
+    async def _call():
+        calls.append(None)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return _call, calls
+
+
+async def test_retry_until_success(sleeps):
+    """Transient errors are retried with jittered, growing delays."""
+    call, calls = _failing([aiohttp.ClientConnectionError(), asyncio.TimeoutError()])
+
+    assert await async_retry(call, 3, 0.5, 4) == "ok"
+
+    assert len(calls) == 3
+    assert 0 <= sleeps[0] <= 0.5
+    assert 0 <= sleeps[1] <= 1.0
+
+
+async def test_retry_delay_is_capped(sleeps):
+    """No delay exceeds max_delay, however many attempts there are."""
+    call, _ = _failing([aiohttp.ClientConnectionError()] * 5)
+
+    assert await async_retry(call, 6, 1, 2) == "ok"
+
+    assert len(sleeps) == 5
+    assert all(0 <= delay <= 2 for delay in sleeps)
+
+
+async def test_retry_gives_up(sleeps):
+    """The last error is raised once the attempts are used up."""
+    call, calls = _failing([aiohttp.ClientConnectionError()] * 3)
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        await async_retry(call, 3, 0.5, 4)
+
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+
+
+async def test_retry_skips_permanent_errors(sleeps):
+    """Errors that won't go away, like a bad status, fail immediately."""
+    call, calls = _failing([WatchYourLANApiError("status 500")])
+
+    with pytest.raises(WatchYourLANApiError):
+        await async_retry(call, 3, 0.5, 4)
+
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(3, 30, 600)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+
+def test_breaker_half_opens_after_cooldown(clock):
+    breaker = CircuitBreaker(1, 30, 600)
+    breaker.record_failure()
+
+    clock.now += 29
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now += 1
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+
+
+def test_breaker_failed_trial_doubles_cooldown(clock):
+    breaker = CircuitBreaker(1, 30, 100)
+    breaker.record_failure()
+
+    for cooldown in (60, 100, 100):
+        clock.now += breaker.cooldown
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        breaker.record_failure()
+        assert breaker.cooldown == cooldown
+        assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_breaker_successful_trial_closes(clock):
+    breaker = CircuitBreaker(1, 30, 600)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.record_failure()
+    clock.now += 60
+
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+    assert breaker.cooldown == 30
@@ -0,0 +1,54 @@
+"""Tests for the WatchYourLAN services."""
+import pytest
+from homeassistant.core import Context
+from homeassistant.exceptions import Unauthorized
+
+from custom_components.watchyourlan.const import (
+    DOMAIN,
+    SERVICE_EXPORT_INVENTORY,
+    SERVICE_PRUNE_DEVICES,
+)
+
+
+@pytest.mark.parametrize(
+    ("service", "return_response"),
+    [(SERVICE_PRUNE_DEVICES, False), (SERVICE_EXPORT_INVENTORY, True)],
+)
+async def test_services_require_admin(
+    hass, setup_integration, hass_read_only_user, service, return_response
+):
+    """Users who are not admins can neither prune devices nor export."""
+    await setup_integration()
+
+    with pytest.raises(Unauthorized):
+        await hass.services.async_call(
+            DOMAIN,
+            service,
+            {},
+            blocking=True,
+            context=Context(user_id=hass_read_only_user.id),
+            return_response=return_response,
+        )
+
+
+async def test_export_inventory_for_admin(
+    hass, fake_server, setup_integration, hass_admin_user, tmp_path
+):
+    """An admin gets the written files back in the service response."""
+    hass.config.config_dir = str(tmp_path)
+    entry = await setup_integration()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_EXPORT_INVENTORY,
+        {"format": "jsonl"},
+        blocking=True,
+        context=Context(user_id=hass_admin_user.id),
+        return_response=True,
+    )
+
+    [exported] = response["files"]
+    assert exported["entry_id"] == entry.entry_id
+    assert exported["hosts"] == len(fake_server.lan.hosts)
+    with open(exported["path"], encoding="utf-8") as file:
+        assert sum(1 for _ in file) == len(fake_server.lan.hosts)
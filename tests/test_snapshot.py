@@ -0,0 +1,35 @@
+"""Tests for the persisted host snapshot."""
+from datetime import timedelta
+
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.watchyourlan.const import DOMAIN, SNAPSHOT_SAVE_DELAY
+
+
+async def test_unload_writes_pending_snapshot(
+    hass, fake_server, setup_integration, hass_storage
+):
+    """Unloading writes the table right away instead of after the delay."""
+    entry = await setup_integration()
+    key = f"{DOMAIN}.{entry.entry_id}.hosts"
+    assert key not in hass_storage
+
+    await hass.config_entries.async_unload(entry.entry_id)
+
+    assert len(hass_storage[key]["data"]["hosts"]) == len(fake_server.lan.hosts)
+
+
+async def test_removed_entry_leaves_no_snapshot(
+    hass, fake_server, setup_integration, hass_storage, freezer
+):
+    """No delayed save recreates the snapshot once the entry is removed."""
+    entry = await setup_integration()
+    key = f"{DOMAIN}.{entry.entry_id}.hosts"
+
+    assert await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    freezer.tick(timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert key not in hass_storage
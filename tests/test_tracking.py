@@ -0,0 +1,94 @@
+"""Tests for tracking rules."""
+import pytest
+
+from custom_components.watchyourlan.hosts import Host
+from custom_components.watchyourlan.tracking import (
+    TrackingMatcher,
+    build_rule,
+    describe_rule,
+)
+
+
+def _host(mac="aa:bb:cc:00:00:01", name="Living room TV", known=True,
+          ip="192.168.1.20", vendor="Samsung Electronics", iface="eth0") -> Host:
+    return Host(1, mac, name, True, known, ip, vendor, iface, "", "")
+
+
+def test_build_rule_leaves_out_empty_criteria():
+    assert build_rule(name=" tv ", vendor="", mac_prefix="AA-BB-CC") == {
+        "name": "tv",
+        "mac_prefix": "aa:bb:cc",
+    }
+    assert build_rule(ip_network="192.168.1.7/24", known="unknown") == {
+        "ip_network": "192.168.1.0/24",
+        "known": False,
+    }
+    assert build_rule() == {}
+
+
+@pytest.mark.parametrize(
+    "criteria", [{"vendor": "Apple("}, {"ip_network": "192.168.1.0/33"}]
+)
+def test_build_rule_rejects_invalid_criteria(criteria):
+    with pytest.raises(ValueError):
+        build_rule(**criteria)
+
+
+@pytest.mark.parametrize(
+    ("rule", "host", "expected"),
+    [
+        ({"name": "TV"}, _host(), True),
+        ({"name": "living*"}, _host(), True),
+        ({"name": "*kitchen*"}, _host(), False),
+        ({"name": "tv"}, _host(name=None), False),
+        ({"vendor": "^samsung"}, _host(), True),
+        ({"vendor": "apple|google"}, _host(), False),
+        ({"mac_prefix": "aa:bb:cc"}, _host(mac="AA-BB-CC-00-00-02"), True),
+        ({"mac_prefix": "aa:bb:cd"}, _host(), False),
+        ({"ip_network": "192.168.1.0/24"}, _host(), True),
+        ({"ip_network": "10.0.0.0/8"}, _host(), False),
+        ({"ip_network": "192.168.1.0/24"}, _host(ip="not an ip"), False),
+        ({"iface": "eth0"}, _host(), True),
+        ({"known": False}, _host(), False),
+        ({"known": False}, _host(known=False), True),
+    ],
+)
+def test_rule_criteria(rule, host, expected):
+    assert TrackingMatcher([rule]).matches(host) is expected
+
+
+def test_criteria_and_rules_combine():
+    """Criteria of one rule must all hold; any one rule is enough."""
+    tv = _host()
+    laptop = _host(name="Work laptop", vendor="Lenovo", known=False)
+    both = TrackingMatcher([{"name": "tv", "known": False}])
+    either = TrackingMatcher([{"name": "tv"}, {"known": False}])
+
+    assert not both.matches(tv)
+    assert not both.matches(laptop)
+    assert either.matches(tv)
+    assert either.matches(laptop)
+    assert not either.matches(_host(name="Printer"))
+
+
+def test_matcher_fields():
+    matcher = TrackingMatcher([{"name": "tv", "ip_network": "10.0.0.0/8"}, {"mac_prefix": "aa"}])
+
+    assert matcher.fields == {"name", "ip", "mac"}
+    assert TrackingMatcher().fields == frozenset()
+    assert not TrackingMatcher()
+
+
+def test_invalid_stored_rules_are_skipped():
+    matcher = TrackingMatcher([{"vendor": "Apple("}, {"name": "tv"}])
+
+    assert matcher
+    assert matcher.matches(_host())
+    assert not TrackingMatcher([{"ip_network": "nonsense"}])
+
+
+def test_describe_rule():
+    assert describe_rule({}) == "all hosts"
+    assert describe_rule({"name": "tv", "iface": "eth0", "known": False}) == (
+        'name matches "tv", on eth0, unknown'
+    )